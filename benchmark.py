@@ -0,0 +1,368 @@
+"""
+Benchmark mandiri untuk pipeline ETL dan dashboard.
+
+Contoh:
+    python benchmark.py memory --rows 1000000 --chunksize 50000
+    python benchmark.py dashboard --sizes 10000,1000000
+    python benchmark.py frame --sizes 100000,1000000
+    python benchmark.py kpi --rows 100000 --windows 200
+    python benchmark.py suite --sizes 10000,100000,1000000 --output hasil.json --baseline hasil_lama.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from sqlalchemy import create_engine
+
+from charts import genre_figures, payload_points, sales_performance_figures, satisfaction_figures, top_directors_figure
+from dataset import BRIDGES, build_genre_index, count_year_rows, load_movie_dataset, popular_genres, top_directors_by_genre, year_rows
+from etl import iter_etl_process, run_etl_process
+from kpi import build_kpi_index, period_kpis
+from legacy_dashboard import legacy_kpis, legacy_render, load_legacy_movies, random_kpi_windows
+from loader import load_to_mysql, materialize_rollups
+from profiling import Profiler, peak_rss_mb
+from rollups import load_rollup_tables, per_genre, per_year
+from snapshot import load_snapshot, publish_snapshot
+
+GENRES = ['Action', 'Adventure', 'Animation', 'Biography', 'Comedy', 'Crime', 'Drama', 'Family',
+          'Fantasy', 'History', 'Horror', 'Music', 'Musical', 'Mystery', 'Romance', 'Sci-Fi',
+          'Sport', 'Thriller', 'War', 'Western']
+FIRST_NAMES = ['James', 'Mary', 'Akira', 'Sofia', 'Pedro', 'Zoë', 'Chloé', 'Lars', 'Ingrid', 'Wong',
+               'Anna', 'Rajesh', 'Fatima', 'Jean-Luc', 'Björn', 'Sean', 'Greta', 'Denis', 'Ayşe', 'Kim']
+LAST_NAMES = ['Smith', 'Kurosawa', 'Almodóvar', 'Müller', 'Villeneuve', 'Bergman', 'Kar-wai', 'Nolan',
+              'Gerwig', 'Lee', 'Ray', 'Haneke', 'Campion', 'Bong', 'Jenkins', 'Varda', 'Loach', 'Tarr',
+              'Ceylan', 'Kiarostami', 'Scott', 'Fincher', 'Coppola', 'Demme', 'Wright']
+
+
+def _name_pool(size, rng):
+    """Membuat `size` nama orang unik (termasuk karakter non-ASCII)."""
+    first = rng.choice(FIRST_NAMES, size)
+    last = rng.choice(LAST_NAMES, size)
+    names = pd.Series(first, dtype=object) + ' ' + pd.Series(last, dtype=object)
+    return (names + ' ' + pd.Series(np.arange(size)).map(_letter_suffix)).to_numpy()
+
+
+def _letter_suffix(number):
+    """Akhiran huruf (A, B, ..., AA, ...) agar nama unik tanpa memakai digit."""
+    letters = ''
+    number += 1
+    while number:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def _join_choices(pool, rows, max_items, rng):
+    """Kolom multi-nilai 'a, b, c' dengan 1..max_items nilai per baris."""
+    counts = rng.integers(1, max_items + 1, rows)
+    joined = pd.Series(rng.choice(pool, rows), dtype=object)
+    for position in range(1, max_items):
+        extra = pd.Series(rng.choice(pool, rows), dtype=object)
+        joined = joined.where(counts <= position, joined + ', ' + extra)
+    return joined
+
+
+def generate_csv(path, rows, seed=0):
+    """Menulis CSV sintetis berbentuk Top_10000_Movies_IMDb_with_Time.csv."""
+    rng = np.random.default_rng(seed)
+    directors = _name_pool(max(10, rows // 8), rng)
+    stars = _name_pool(max(30, rows // 2), rng)
+    metascore = rng.integers(10, 100, rows).astype(float)
+    metascore[rng.random(rows) < 0.15] = np.nan
+    gross = rng.integers(10_000, 900_000_000, rows).astype(float)
+    gross[rng.random(rows) < 0.3] = np.nan
+    df = pd.DataFrame({
+        'ID': np.arange(1, rows + 1),
+        'Movie Name': [f'Movie {i}' for i in range(1, rows + 1)],
+        'Rating': rng.integers(10, 100, rows) / 10,
+        'Runtime': pd.Series(rng.integers(60, 220, rows)).astype(str) + ' min',
+        'Genre': _join_choices(np.array(GENRES), rows, 3, rng),
+        'Metascore': metascore,
+        'Plot': 'A synthetic plot used for benchmarking the ETL pipeline.',
+        'Directors': _join_choices(directors, rows, 2, rng),
+        'Stars': _join_choices(stars, rows, 4, rng),
+        'Votes': rng.integers(100, 2_500_000, rows),
+        'Gross': gross,
+        'Link': [f'https://www.imdb.com/title/tt{i:07d}/' for i in range(1, rows + 1)],
+        'Time': rng.integers(1920, 2024, rows),
+    })
+    df.to_csv(path, index=False)
+    return path
+
+
+def _run_etl_child(mode, csv_path, chunksize):
+    """Dijalankan di subproses agar puncak RSS setiap mode terukur terpisah."""
+    started = time.perf_counter()
+    # Tanpa cache nama di disk: cache produksi tidak tercemar nama sintetis, dan
+    # mode pertama tidak menghangatkan cache untuk mode kedua
+    if mode == 'full':
+        rows = sum(len(df) for df in run_etl_process(csv_path, name_cache=None).values())
+    else:
+        rows = sum(len(df) for _, df in iter_etl_process(csv_path, chunksize=chunksize, name_cache=None))
+    print(f"{mode}\t{rows}\t{time.perf_counter() - started:.2f}\t{peak_rss_mb() or float('nan'):.1f}")
+
+
+def benchmark_memory(rows, chunksize, csv_path=None):
+    """Membandingkan puncak RSS ETL penuh (read_csv sekaligus) vs streaming per chunk."""
+    with tempfile.TemporaryDirectory() as tmp:
+        if csv_path is None:
+            csv_path = os.path.join(tmp, f'movies_{rows}.csv')
+            print(f"Membuat CSV sintetis {rows:,} baris di {csv_path} ...")
+            generate_csv(csv_path, rows)
+        print(f"{'mode':<10}{'baris keluar':>14}{'waktu (dtk)':>14}{'puncak RSS (MB)':>18}")
+        for mode in ('full', 'stream'):
+            result = subprocess.run(
+                [sys.executable, __file__, '_etl', mode, csv_path, str(chunksize)],
+                check=True, capture_output=True, text=True)
+            name, out_rows, elapsed, rss = result.stdout.strip().splitlines()[-1].split('\t')
+            print(f"{name:<10}{int(out_rows):>14,}{float(elapsed):>14.2f}{float(rss):>18.1f}")
+
+
+def _timed(function, *args, repeat=1):
+    """Menjalankan `function` dan mengembalikan (hasil terakhir, waktu terbaik dalam dtk)."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+
+def build_sqlite_warehouse(rows, directory, chunksize=100_000, profiler=None):
+    """
+    Membuat CSV sintetis lalu menjalankan ETL + rollup ke database SQLite lokal.
+    Tahap ETL, muat, dan rollup dicatat di `profiler` bila diberikan.
+    """
+    csv_path = generate_csv(os.path.join(directory, f'movies_{rows}.csv'), rows)
+    engine = create_engine(f"sqlite:///{os.path.join(directory, f'warehouse_{rows}.db')}")
+    load_to_mysql(engine, iter_etl_process(csv_path, chunksize=chunksize, name_cache=None, profiler=profiler),
+                  progress=lambda _: None, profiler=profiler)
+    materialize_rollups(engine, progress=lambda _: None, profiler=profiler)
+    return engine
+
+
+def _new_render(dataset, rollups, year_range, rating_range):
+    """Komputasi data per rerun pada dashboard baru (bridge berkode integer + rollup)."""
+    df = dataset['movies']
+    filtered = df.iloc[year_rows(dataset['year_index'], year_range, rating_range)]
+    previous_range = (year_range[0] - 1 - (year_range[1] - year_range[0]), year_range[0] - 1)
+    previous = df.iloc[year_rows(dataset['year_index'], previous_range)]
+    popular_genres(dataset, filtered.index)
+    popular_genres(dataset, previous.index)
+    per_year(rollups['agg_year'], year_range, rating_range)
+    per_genre(rollups['agg_year_genre'], rollups['dim_genre'], year_range, rating_range)
+    top_directors_by_genre(dataset, dataset['genre_index'], 'Drama', year_range, rating_range)
+
+
+def benchmark_dashboard(sizes):
+    """Membandingkan waktu kueri dan komputasi per rerun dashboard lama vs baru."""
+    print(f"{'film':>10}{'kueri lama':>14}{'kueri baru':>14}{'render lama':>14}{'render baru':>14}  (dtk)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            engine = build_sqlite_warehouse(rows, tmp)
+            legacy_df, legacy_query = _timed(load_legacy_movies, engine)
+            dataset, new_query = _timed(load_movie_dataset, engine)
+            dataset['genre_index'] = build_genre_index(dataset)
+            rollups = load_rollup_tables(engine)
+            window = ((1990, 2010), (5.0, 9.0))
+            _, legacy_time = _timed(legacy_render, legacy_df, *window, repeat=3)
+            _, new_time = _timed(_new_render, dataset, rollups, *window, repeat=3)
+            print(f"{rows:>10,}{legacy_query:>14.2f}{new_query:>14.2f}{legacy_time:>14.3f}{new_time:>14.3f}")
+            engine.dispose()
+
+
+def _frame_mb(df):
+    return df.memory_usage(deep=True).sum() / 2**20
+
+
+def _dataset_mb(dataset):
+    """Ukuran frame film ditambah array bridge berkode integer (MB)."""
+    bridges = sum(array.nbytes for bridge_name in BRIDGES for array in
+                  (dataset[bridge_name]['movie_pos'], dataset[bridge_name]['ids']))
+    return _frame_mb(dataset['movies']) + bridges / 2**20
+
+
+def benchmark_frame_memory(sizes):
+    """
+    Memori frame film per sesi Streamlit, dashboard lama vs baru. Dulu setiap
+    sesi menerima salinan frame dari st.cache_data ditambah salinan hasil
+    filter; sekarang satu frame ringkas dibagi lewat st.cache_resource dan
+    setiap sesi hanya memegang hasil filter (slice jika memungkinkan).
+    """
+    window = ((1990, 2010), (5.0, 9.0))
+    print(f"{'film':>10}{'frame lama':>12}{'/sesi lama':>12}{'frame baru':>12}{'/sesi baru':>12}  (MB)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            engine = build_sqlite_warehouse(rows, tmp)
+            legacy_df = load_legacy_movies(engine)
+            legacy_filtered = legacy_df[legacy_df['Year'].between(*window[0])
+                                        & legacy_df['Rating'].between(*window[1])].copy()
+            snapshot_dir = os.path.join(tmp, f'snapshot_{rows}')
+            dataset, _ = load_snapshot(publish_snapshot(engine, snapshot_dir, progress=lambda _: None), snapshot_dir)
+            filtered = dataset['movies'].iloc[year_rows(dataset['year_index'], *window)]
+            legacy_mb = _frame_mb(legacy_df)
+            print(f"{rows:>10,}{legacy_mb:>12.1f}{legacy_mb + _frame_mb(legacy_filtered):>12.1f}"
+                  f"{_dataset_mb(dataset):>12.1f}{_frame_mb(filtered):>12.1f}")
+            engine.dispose()
+
+
+def benchmark_kpis(rows, windows, seed=0):
+    """
+    Waktu KPI per rerun: perhitungan pandas dashboard lama vs `period_kpis`
+    (prefix sum). Kecocokan nilainya diuji di tests/test_kpi.py.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_sqlite_warehouse(rows, tmp)
+        dataset = load_movie_dataset(engine)
+        legacy_df = load_legacy_movies(engine)
+        engine.dispose()
+    kpi_index, build_time = _timed(build_kpi_index, dataset)
+
+    legacy_time = engine_time = 0.0
+    for year_range, rating_range in random_kpi_windows(dataset['year_index']['years'], windows, seed):
+        legacy_time += _timed(legacy_kpis, legacy_df, year_range, rating_range)[1]
+        engine_time += _timed(period_kpis, kpi_index, year_range, rating_range)[1]
+    print(f"{rows:,} film, {windows} rentang. Bangun indeks {build_time:.3f} dtk; "
+          f"pandas {legacy_time / windows * 1000:.2f} ms vs prefix sum {engine_time / windows * 1000:.3f} ms per rerun.")
+
+
+# Tahap yang lebih lambat dari baseline melebihi rasio ini dan selisih ini (dtk) dianggap regresi
+REGRESSION_RATIO = 1.25
+REGRESSION_MIN_SECONDS = 0.05
+
+
+def _profile_queries(dataset, rollups, profiler, window=((1990, 2010), (5.0, 9.0))):
+    """Mengukur komputasi per rerun dashboard (KPI dan pembangun figur) pada satu rentang filter."""
+    rows_in = count_year_rows(dataset['year_index'], *window)
+    steps = {
+        'period_kpis': lambda: period_kpis(dataset['kpi_index'], *window),
+        'sales_performance_figures': lambda: sales_performance_figures(dataset, rollups, *window),
+        'genre_figures': lambda: genre_figures(rollups, *window),
+        'satisfaction_figures': lambda: satisfaction_figures(dataset, rollups, *window),
+        'top_directors_figure': lambda: top_directors_figure(dataset, 'Drama', *window),
+    }
+    for name, step in steps.items():
+        with profiler.stage(name, rows_in=rows_in) as record:
+            result = step()
+            # Baris keluar = elemen data figur yang akan dikirim ke browser
+            figures = result.values() if isinstance(result, dict) else [result]
+            record['rows_out'] = payload_points(*(figure for figure in figures if isinstance(figure, go.Figure)))
+
+
+def _compare_runs(results, baseline):
+    """Mencetak tahap yang melambat dibanding `baseline`; mengembalikan jumlah regresi."""
+    regressions = 0
+    for size, scopes in results['sizes'].items():
+        for scope, stages in scopes.items():
+            previous = {stage['stage']: stage for stage in baseline.get('sizes', {}).get(size, {}).get(scope, [])}
+            for stage in stages:
+                old = previous.get(stage['stage'])
+                if old is None:
+                    continue
+                slower = stage['seconds'] - old['seconds']
+                if stage['seconds'] > old['seconds'] * REGRESSION_RATIO and slower > REGRESSION_MIN_SECONDS:
+                    regressions += 1
+                    print(f"  ✗ {int(size):,} film, {scope}/{stage['stage']}: "
+                          f"{old['seconds']:.3f} → {stage['seconds']:.3f} dtk (+{slower:.3f})")
+    print(f"{regressions} regresi dibanding baseline.")
+    return regressions
+
+
+def benchmark_suite(sizes, chunksize, output=None, baseline=None):
+    """
+    Rangkaian benchmark untuk melacak regresi: untuk setiap ukuran dibuat CSV
+    sintetis, lalu ETL streaming + muat ke SQLite + rollup + snapshot diprofil
+    per tahap (scope 'etl'), dilanjutkan dengan memuat snapshot dan komputasi
+    per rerun dashboard (scope 'queries'). Hasil per tahap ditulis ke `output`
+    (JSON) dan dibandingkan dengan `baseline` bila diberikan.
+    """
+    results = {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'chunksize': chunksize, 'sizes': {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            etl_profiler = Profiler('etl', log_path=None)
+            engine = build_sqlite_warehouse(rows, tmp, chunksize, profiler=etl_profiler)
+            snapshot_dir = os.path.join(tmp, f'snapshot_{rows}')
+            version = publish_snapshot(engine, snapshot_dir, progress=lambda _: None, profiler=etl_profiler)
+            engine.dispose()
+
+            query_profiler = Profiler('queries', log_path=None)
+            with query_profiler.stage('load_snapshot') as record:
+                dataset, rollups = load_snapshot(version, snapshot_dir)
+                record['rows_out'] = len(dataset['movies'])
+            _profile_queries(dataset, rollups, query_profiler)
+
+            print(f"{rows:,} film:")
+            for line in etl_profiler.summary_lines() + query_profiler.summary_lines():
+                print(line)
+            results['sizes'][str(rows)] = {'etl': etl_profiler.records(), 'queries': query_profiler.records()}
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Hasil ditulis ke {output}.")
+    if baseline:
+        with open(baseline, encoding='utf-8') as f:
+            return _compare_runs(results, json.load(f)) == 0
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pipeline ETL dashboard film.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    memory = commands.add_parser('memory', help="Puncak RSS ETL penuh vs streaming.")
+    memory.add_argument('--rows', type=int, default=1_000_000)
+    memory.add_argument('--chunksize', type=int, default=50_000)
+    memory.add_argument('--csv', help="Pakai CSV yang sudah ada alih-alih membuat data sintetis.")
+
+    dashboard = commands.add_parser('dashboard', help="Waktu kueri dan render dashboard lama vs baru.")
+    dashboard.add_argument('--sizes', default='10000,1000000',
+                           help="Daftar jumlah film dipisah koma (default: 10000,1000000).")
+
+    frame = commands.add_parser('frame', help="Memori frame film per sesi dashboard lama vs baru.")
+    frame.add_argument('--sizes', default='100000,1000000',
+                       help="Daftar jumlah film dipisah koma (default: 100000,1000000).")
+
+    kpi = commands.add_parser('kpi', help="Waktu KPI prefix sum vs pandas dashboard lama.")
+    kpi.add_argument('--rows', type=int, default=100_000)
+    kpi.add_argument('--windows', type=int, default=200)
+
+    suite = commands.add_parser('suite', help="Profil per tahap ETL + kueri dashboard, dengan deteksi regresi.")
+    suite.add_argument('--sizes', default='10000,100000,1000000',
+                       help="Daftar jumlah film dipisah koma (default: 10000,100000,1000000).")
+    suite.add_argument('--chunksize', type=int, default=100_000)
+    suite.add_argument('--output', help="Tulis hasil per tahap ke file JSON ini.")
+    suite.add_argument('--baseline', help="File JSON hasil run sebelumnya untuk dibandingkan.")
+
+    child = commands.add_parser('_etl')
+    child.add_argument('mode', choices=['full', 'stream'])
+    child.add_argument('csv_path')
+    child.add_argument('chunksize', type=int)
+
+    args = parser.parse_args(argv)
+    if args.command == 'memory':
+        benchmark_memory(args.rows, args.chunksize, args.csv)
+    elif args.command == 'dashboard':
+        benchmark_dashboard([int(size) for size in args.sizes.split(',')])
+    elif args.command == 'frame':
+        benchmark_frame_memory([int(size) for size in args.sizes.split(',')])
+    elif args.command == 'kpi':
+        benchmark_kpis(args.rows, args.windows)
+    elif args.command == 'suite':
+        if not benchmark_suite([int(size) for size in args.sizes.split(',')], args.chunksize,
+                               args.output, args.baseline):
+            sys.exit(1)
+    else:
+        _run_etl_child(args.mode, args.csv_path, args.chunksize)
+
+
+if __name__ == '__main__':
+    main()
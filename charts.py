@@ -0,0 +1,187 @@
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+from dataset import top_directors_by_genre, year_rows
+from rollups import per_genre, per_year
+
+# ============================================================================
+# AGREGASI GRAFIK DI SISI SERVER (PAYLOAD TERBATAS)
+# ============================================================================
+# Grafik yang mengirim setiap titik ke browser (scatter, box plot) diganti
+# dengan ringkasan berukuran tetap begitu jumlah film melewati batas, sehingga
+# ukuran payload per rerun tidak tumbuh bersama ukuran dataset.
+
+# Di atas batas ini scatter Rating vs Metascore ditampilkan sebagai grid kepadatan
+SCATTER_POINT_LIMIT = 5_000
+
+# Di atas batas ini box plot dikirim sebagai kuartil yang sudah dihitung
+BOX_POINT_LIMIT = 5_000
+
+# Lebar sel grid kepadatan (Rating per 0.1, Metascore per 2 poin): paling banyak ~91 x 51 sel
+DENSITY_BIN_WIDTHS = (0.1, 2.0)
+
+# Jumlah baris per halaman tabel data mentah
+RAW_PAGE_SIZE = 100
+
+
+def density_grid(movies, x_col, y_col, bin_widths=DENSITY_BIN_WIDTHS):
+    """
+    Histogram 2D `x_col` x `y_col` untuk baris `movies` (baris dengan NaN
+    dilewati). Setiap sel berpusat di kelipatan lebar sel, sehingga rating
+    0.1-an jatuh tepat di tengah sel. Mengembalikan dict 'x' dan 'y' (pusat
+    sel) serta 'z' (jumlah film, bentuk (len(y), len(x)), NaN untuk sel kosong).
+    """
+    x = movies[x_col].to_numpy(dtype=np.float64)
+    y = movies[y_col].to_numpy(dtype=np.float64)
+    keep = ~(np.isnan(x) | np.isnan(y))
+    x_width, y_width = bin_widths
+    x_bins = np.round(x[keep] / x_width).astype(np.int64)
+    y_bins = np.round(y[keep] / y_width).astype(np.int64)
+    if not len(x_bins):
+        return {'x': np.array([]), 'y': np.array([]), 'z': np.empty((0, 0))}
+
+    x_low, y_low = x_bins.min(), y_bins.min()
+    n_x, n_y = x_bins.max() - x_low + 1, y_bins.max() - y_low + 1
+    counts = np.bincount((y_bins - y_low) * n_x + (x_bins - x_low), minlength=n_x * n_y).reshape(n_y, n_x)
+    return {
+        'x': np.round((np.arange(n_x) + x_low) * x_width, 6),
+        'y': np.round((np.arange(n_y) + y_low) * y_width, 6),
+        'z': np.where(counts > 0, counts, np.nan),
+    }
+
+
+def box_stats(values):
+    """
+    Statistik box plot (q1, median, q3, pagar bawah/atas) seperti perhitungan
+    Plotly: kuartil metode linear dan whisker sampai nilai terjauh yang masih
+    di dalam 1.5 x IQR. NaN dilewati; None jika tidak ada nilai.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return None
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return {'q1': q1, 'median': median, 'q3': q3, 'lowerfence': inside.min(), 'upperfence': inside.max()}
+
+
+def page_bounds(total_rows, page, page_size=RAW_PAGE_SIZE):
+    """Jumlah halaman dan rentang baris [start, stop) untuk halaman `page` (mulai dari 1)."""
+    pages = max(1, -(-total_rows // page_size))
+    page = min(max(1, int(page)), pages)
+    start = (page - 1) * page_size
+    return pages, start, min(start + page_size, total_rows)
+
+
+def payload_points(*figures):
+    """
+    Jumlah elemen data yang dikirim ke browser oleh `figures` (per trace:
+    ukuran terbesar dari x/y/z/values/q1). Figur None dilewati.
+    """
+    total = 0
+    for figure in figures:
+        if figure is None:
+            continue
+        for trace in figure.data:
+            sizes = [np.size(trace[name]) for name in ('x', 'y', 'z', 'values', 'q1')
+                     if name in trace and trace[name] is not None]
+            total += max(sizes, default=0)
+    return total
+
+
+# ============================================================================
+# PEMBANGUN FIGUR PER BAGIAN DASHBOARD
+# ============================================================================
+# Setiap fungsi hanya bergantung pada dataset/rollup dan nilai filter, sehingga
+# hasilnya bisa di-memoize per status filter oleh dashboard.
+
+def filtered_movies(dataset, year_range, rating_range):
+    """Baris film di dalam filter tahun + rating (slice tanpa salinan bila memungkinkan)."""
+    return dataset['movies'].iloc[year_rows(dataset['year_index'], year_range, rating_range)]
+
+
+def rating_scatter_figure(filtered_df):
+    """Scatter Rating vs Metascore, atau grid kepadatan jika titiknya melebihi batas. Mengembalikan (figur, catatan)."""
+    if len(filtered_df) <= SCATTER_POINT_LIMIT:
+        figure = px.scatter(filtered_df, x='Rating', y='Metascore', color='Rating', color_continuous_scale=px.colors.sequential.Viridis, hover_name='Movie_Name', labels={'Rating': 'Rating Pengguna (IMDb)', 'Metascore': 'Rating Kritikus'})
+        return figure, None
+    # Terlalu banyak titik: kirim grid kepadatan yang dihitung di server (ukuran tetap)
+    grid = density_grid(filtered_df, 'Rating', 'Metascore')
+    figure = go.Figure(go.Heatmap(x=grid['x'], y=grid['y'], z=grid['z'], colorscale='Viridis', colorbar={'title': 'Jumlah Film'},
+                                  hovertemplate='Rating %{x}<br>Metascore %{y}<br>%{z} film<extra></extra>'))
+    figure.update_layout(xaxis_title='Rating Pengguna (IMDb)', yaxis_title='Rating Kritikus')
+    return figure, f"{len(filtered_df):,} film ditampilkan sebagai kepadatan (jumlah film per sel)."
+
+
+def sales_performance_figures(dataset, rollups, year_range, rating_range):
+    """Empat grafik bagian 'Analisis Penjualan dan Performa'."""
+    filtered_df = filtered_movies(dataset, year_range, rating_range)
+    # Dijawab dari rollup per (Year, Rating), bukan groupby atas seluruh film
+    yearly = per_year(rollups['agg_year'], year_range, rating_range)
+    fig_line_sales = px.line(yearly[['Year', 'Gross']], x='Year', y='Gross', markers=True, labels={'Year': 'Tahun', 'Gross': 'Total Pendapatan ($)'})
+
+    top_10_votes = filtered_df.nlargest(10, 'Votes')
+    fig_bar_votes = px.bar(top_10_votes.sort_values('Votes', ascending=True), x='Votes', y='Movie_Name', orientation='h', labels={'Votes': 'Jumlah Suara', 'Movie_Name': ''}, text_auto=True)
+
+    fig_scatter, scatter_note = rating_scatter_figure(filtered_df)
+
+    top_10_gross = filtered_df.nlargest(10, 'Gross')
+    fig_bar_gross = px.bar(top_10_gross.sort_values('Gross', ascending=True), x='Gross', y='Movie_Name', orientation='h', labels={'Gross': 'Pendapatan (Juta $)', 'Movie_Name': ''}, text_auto='.2s')
+    return {'sales_per_year': fig_line_sales, 'top_votes': fig_bar_votes, 'scatter': fig_scatter,
+            'scatter_note': scatter_note, 'top_gross': fig_bar_gross}
+
+
+def genre_figures(rollups, year_range, rating_range):
+    """
+    Grafik bagian 'Analisis Preferensi Genre' dari rollup per (Year, Rating,
+    Genre), ditambah daftar genre yang muncul pada filter (terurut alfabet).
+    Figur bernilai None jika tidak ada genre.
+    """
+    genre_totals = per_genre(rollups['agg_year_genre'], rollups['dim_genre'], year_range, rating_range)
+    if genre_totals.empty:
+        return {'genres': [], 'pie': None, 'sales': None}
+    genre_counts = genre_totals['Movie_Count'].sort_values(ascending=False)
+    fig_pie_genre = px.pie(names=genre_counts.index, values=genre_counts.values, title="Proporsi Genre Film")
+    fig_pie_genre.update_traces(textposition='inside', textinfo='percent+label', showlegend=False)
+
+    genre_sales = genre_totals['Gross_Sum'].nlargest(10).sort_values()
+    fig_bar_genre_sales = px.bar(genre_sales, x=genre_sales.values, y=genre_sales.index, orientation='h', text_auto='.2s', labels={'x': 'Total Pendapatan', 'y': 'Genre'})
+    return {'genres': sorted(genre_totals.index), 'pie': fig_pie_genre, 'sales': fig_bar_genre_sales}
+
+
+def satisfaction_figures(dataset, rollups, year_range, rating_range):
+    """Box plot rating dan rata-rata rating per tahun (bagian 'Analisis Kepuasan Penonton')."""
+    filtered_df = filtered_movies(dataset, year_range, rating_range)
+    if len(filtered_df) <= BOX_POINT_LIMIT:
+        fig_box_rating = px.box(filtered_df, y='Rating', points='outliers', title="Distribusi Rating Seluruh Film Terfilter")
+    else:
+        # Kuartil dihitung di server agar data setiap film tidak ikut dikirim
+        stats = box_stats(filtered_df['Rating'])
+        fig_box_rating = go.Figure(go.Box(name='Rating', **{key: [value] for key, value in stats.items()}))
+        fig_box_rating.update_layout(title="Distribusi Rating Seluruh Film Terfilter", yaxis_title='Rating')
+
+    yearly = per_year(rollups['agg_year'], year_range, rating_range)
+    fig_bar_avg_rating = px.bar(yearly[['Year', 'Rating']], x='Year', y='Rating', text='Rating', title="Tren Rata-rata Rating IMDb")
+    fig_bar_avg_rating.update_traces(texttemplate='%{text:.2f}', textposition='outside')
+    return {'box': fig_box_rating, 'avg_rating': fig_bar_avg_rating}
+
+
+def top_directors_figure(dataset, genre_name, year_range, rating_range):
+    """Bar 5 sutradara paling produktif pada satu genre; None jika tidak ada data."""
+    # Indeks terbalik Genre_ID -> (film, sutradara): tanpa pencocokan substring ('Music' tidak ikut 'Musical')
+    top_directors_series = top_directors_by_genre(dataset, dataset['genre_index'], genre_name, year_range, rating_range)
+    if top_directors_series.empty:
+        return None
+    figure = px.bar(
+        top_directors_series,
+        x=top_directors_series.values,
+        y=top_directors_series.index,
+        orientation='h',
+        labels={'x': 'Jumlah Film', 'y': 'Nama Sutradara'},
+        text_auto=True,
+        title=f"Top 5 Sutradara Paling Produktif di Genre '{genre_name}'"
+    )
+    figure.update_layout(yaxis={'categoryorder': 'total ascending'})
+    return figure
@@ -0,0 +1,78 @@
+import json
+import os
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+
+# ============================================================================
+# KONFIGURASI KONEKSI DATABASE + ENGINE DENGAN CONNECTION POOL
+# ============================================================================
+# Dipakai bersama oleh dashboard (satu engine per proses, dibagi semua sesi)
+# dan oleh perintah ETL tanpa Streamlit (run_etl.py). Nilai diambil berurutan
+# dari default, file konfigurasi JSON, lalu variabel lingkungan (yang terakhir
+# menang).
+
+DEFAULT_SETTINGS = {
+    'database_url': "mysql+pymysql://root:@localhost/TB_BI",
+    # Koneksi yang disimpan di pool dan tambahan sementara saat semua terpakai
+    'pool_size': 5,
+    'max_overflow': 10,
+    # Koneksi lebih tua dari ini (detik) dibuka ulang; di bawah wait_timeout MySQL (8 jam)
+    'pool_recycle': 3600,
+    # Ukuran chunk baca CSV untuk ETL streaming; None = baca sekaligus
+    'chunksize': None,
+}
+
+# File konfigurasi opsional; lokasinya bisa diganti lewat ETL_CONFIG
+CONFIG_PATH = 'etl_config.json'
+
+ENV_SETTINGS = {
+    'database_url': ('ETL_DATABASE_URL', str),
+    'pool_size': ('ETL_POOL_SIZE', int),
+    'max_overflow': ('ETL_MAX_OVERFLOW', int),
+    'pool_recycle': ('ETL_POOL_RECYCLE', int),
+    'chunksize': ('ETL_CHUNKSIZE', int),
+}
+
+
+def load_settings(config_path=None, environ=None):
+    """
+    Pengaturan koneksi dan ETL: DEFAULT_SETTINGS ditimpa isi file JSON
+    `config_path` (default ETL_CONFIG atau CONFIG_PATH), lalu variabel
+    lingkungan ETL_*. Hanya CONFIG_PATH bawaan yang boleh tidak ada; file yang
+    disebut eksplisit tetapi tidak ada menimbulkan FileNotFoundError, dan kunci
+    yang tidak dikenal menimbulkan ValueError. `chunksize` 0 berarti baca sekaligus.
+    """
+    environ = os.environ if environ is None else environ
+    settings = dict(DEFAULT_SETTINGS)
+
+    path = config_path or environ.get('ETL_CONFIG')
+    if path and not os.path.exists(path):
+        raise FileNotFoundError(f"File konfigurasi tidak ditemukan: {path}")
+    path = path or CONFIG_PATH
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            overrides = json.load(f)
+        unknown = set(overrides) - set(DEFAULT_SETTINGS)
+        if unknown:
+            raise ValueError(f"Kunci konfigurasi tidak dikenal di {path}: {', '.join(sorted(unknown))}")
+        settings.update(overrides)
+
+    for key, (name, cast) in ENV_SETTINGS.items():
+        if environ.get(name):
+            settings[key] = cast(environ[name])
+    settings['chunksize'] = settings['chunksize'] or None
+    return settings
+
+
+def create_pooled_engine(settings):
+    """
+    Engine SQLAlchemy dengan QueuePool sesuai `settings`. Koneksi diuji
+    sebelum dipinjam (pool_pre_ping) agar koneksi yang diputus server tidak
+    sampai ke kueri. SQLite memakai pool bawaannya sendiri.
+    """
+    url = make_url(settings['database_url'])
+    if url.get_backend_name() == 'sqlite':
+        return create_engine(url)
+    return create_engine(url, pool_size=settings['pool_size'], max_overflow=settings['max_overflow'],
+                         pool_recycle=settings['pool_recycle'], pool_pre_ping=True)
@@ -0,0 +1,294 @@
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# DATASET DASHBOARD: FAKTA PER FILM + BRIDGE GENRE/SUTRADARA BERKODE INTEGER
+# ============================================================================
+# Fakta dan bridge diambil dengan kueri set-based terpisah (tanpa subkueri
+# berkorelasi per baris). Genre dan sutradara disimpan sebagai pasangan
+# (posisi baris film, ID dimensi) sehingga grafik tidak perlu memecah string.
+
+MOVIES_QUERY = """
+SELECT
+    dm.Movie_ID,
+    dm.Movie_Name,
+    dm.Runtime,
+    dt.Year,
+    fm.Rating,
+    fm.Metascore,
+    fm.Votes,
+    fm.Gross
+FROM
+    fact_movie fm
+JOIN
+    dim_movie dm ON fm.Movie_ID = dm.Movie_ID
+JOIN
+    dim_time dt ON fm.Time_ID = dt.Time_ID
+"""
+
+# Sinopsis hanya dibutuhkan tabel data mentah, jadi dimuat terpisah (lazy)
+PLOTS_QUERY = "SELECT Movie_ID, Plot FROM dim_movie"
+
+# Tipe kolom ringkas untuk frame film yang dibagi oleh semua sesi dashboard.
+# Gross tetap float64 karena dijumlahkan hingga triliunan.
+MOVIE_DTYPES = {
+    'Movie_ID': 'int64',
+    'Movie_Name': pd.StringDtype('pyarrow', na_value=np.nan),
+    'Runtime': 'int16',
+    'Year': 'int16',
+    'Rating': 'float32',
+    'Metascore': 'float32',
+    'Votes': 'int32',
+    'Gross': 'float64',
+}
+
+# nama bridge -> (tabel dimensi, kolom ID, kolom nama)
+BRIDGES = {
+    'bridge_genre': ('dim_genre', 'Genre_ID', 'Genre_Name'),
+    'bridge_director': ('dim_director', 'Director_ID', 'Director_Name'),
+}
+
+
+def _fetch_id_pairs(engine, query):
+    """
+    Membaca kueri dua kolom integer langsung dari cursor DBAPI ke array numpy
+    (n, 2), tanpa membangun objek Row/DataFrame per baris.
+    """
+    with engine.connect() as conn:
+        cursor = conn.exec_driver_sql(query).cursor
+        flat = np.fromiter((value for row in cursor for value in row), dtype=np.int64)
+    return flat.reshape(-1, 2)
+
+
+def _coded_bridge(pairs, movie_index):
+    """Mengubah pasangan (Movie_ID, ID) menjadi array posisi baris film dan ID dimensi."""
+    positions = movie_index.get_indexer(pairs[:, 0])
+    known = positions >= 0
+    return {'movie_pos': positions[known].astype(np.int32), 'ids': pairs[known, 1].astype(np.int32)}
+
+
+def names_by_id(dim, id_col, name_col):
+    """Array nama yang diindeks langsung oleh surrogate key (indeks 0 tidak dipakai)."""
+    names = np.full(int(dim[id_col].max() if len(dim) else 0) + 1, None, dtype=object)
+    names[dim[id_col].to_numpy()] = dim[name_col].to_numpy()
+    return names
+
+
+def load_movie_dataset(engine):
+    """
+    Mengambil data film dan bridge dari database. Mengembalikan dictionary:
+    'movies' (satu baris per film, terurut per Year lalu Rating, RangeIndex =
+    posisi baris), 'year_index' (lihat `build_year_index`), dan untuk setiap
+    bridge: {'movie_pos', 'ids'} serta array 'names' per ID dimensi.
+    """
+    df = pd.read_sql(MOVIES_QUERY, con=engine)
+
+    # Proses pembersihan data sekarang jauh lebih cepat karena data tidak bengkak
+    df['Votes'] = pd.to_numeric(df['Votes'], errors='coerce').fillna(0)
+    df['Gross'] = pd.to_numeric(df['Gross'], errors='coerce').fillna(0)
+    df['Runtime'] = df['Runtime'].astype(str).str.replace(' min', '', regex=False)
+    df['Runtime'] = pd.to_numeric(df['Runtime'], errors='coerce').fillna(0)
+    df = df.astype(MOVIE_DTYPES)
+    # Urutan (Year, Rating) membuat filter rentang tahun/rating menjadi pencarian offset
+    df = df.sort_values(['Year', 'Rating', 'Movie_ID'], kind='stable', na_position='last').reset_index(drop=True)
+
+    movie_index = pd.Index(df['Movie_ID'])
+    dataset = {'movies': df, 'year_index': build_year_index(df)}
+    for bridge_name, (dim_name, id_col, name_col) in BRIDGES.items():
+        pairs = _fetch_id_pairs(engine, f"SELECT Movie_ID, {id_col} FROM {bridge_name}")
+        dim = pd.read_sql(f"SELECT {id_col}, {name_col} FROM {dim_name}", con=engine)
+        dataset[bridge_name] = {**_coded_bridge(pairs, movie_index),
+                                'names': names_by_id(dim, id_col, name_col)}
+    return dataset
+
+
+def load_plots(engine, movies):
+    """Kolom Plot dari database, diselaraskan dengan posisi baris `movies`."""
+    plots = pd.read_sql(PLOTS_QUERY, con=engine).set_index('Movie_ID')['Plot']
+    return plots.reindex(movies['Movie_ID'].to_numpy()).reset_index(drop=True).astype(MOVIE_DTYPES['Movie_Name'])
+
+
+def build_year_index(movies):
+    """
+    Indeks pra-filter untuk `movies` yang terurut per (Year, Rating): tahun
+    unik beserta offset baris awalnya ('offsets' punya satu elemen penutup),
+    dan array rating untuk pencarian biner di dalam setiap tahun.
+    """
+    years = movies['Year'].to_numpy()
+    if len(years) and (np.diff(years) < 0).any():
+        raise ValueError("Data film harus terurut berdasarkan Year untuk membangun indeks tahun.")
+    unique_years, starts = np.unique(years, return_index=True)
+    return {'years': unique_years.astype(np.int64), 'offsets': np.append(starts, len(years)),
+            'ratings': movies['Rating'].to_numpy()}
+
+
+def _rating_blocks(year_index, year_range, rating_range):
+    """Blok baris [low, high) per tahun di dalam rentang tahun + rating (inklusif)."""
+    years, offsets = year_index['years'], year_index['offsets']
+    first = np.searchsorted(years, year_range[0], side='left')
+    last = np.searchsorted(years, year_range[1], side='right')
+
+    # Di dalam setiap tahun rating terurut naik (NaN di akhir), jadi cukup dua pencarian biner per tahun
+    ratings = year_index['ratings']
+    # Batas dibulatkan ke dtype kolom (float32) agar 7.1 dari slider sama dengan 7.1 yang tersimpan
+    rating_low, rating_high = ratings.dtype.type(rating_range[0]), ratings.dtype.type(rating_range[1])
+    blocks = []
+    for year_pos in range(first, last):
+        start, stop = offsets[year_pos], offsets[year_pos + 1]
+        segment = ratings[start:stop]
+        low = start + np.searchsorted(segment, rating_low, side='left')
+        high = start + np.searchsorted(segment, rating_high, side='right')
+        if high > low:
+            blocks.append((int(low), int(high)))
+    return blocks
+
+
+def year_rows(year_index, year_range, rating_range=None):
+    """
+    Baris film di dalam rentang tahun (dan rentang rating, inklusif) tanpa
+    memindai seluruh data. Mengembalikan `slice` jika hasilnya satu blok
+    berurutan (selalu, bila `rating_range` None), atau array posisi baris.
+    Keduanya bisa langsung dipakai dengan `movies.iloc[...]`.
+    """
+    if rating_range is None:
+        years, offsets = year_index['years'], year_index['offsets']
+        first = np.searchsorted(years, year_range[0], side='left')
+        last = np.searchsorted(years, year_range[1], side='right')
+        return slice(int(offsets[first]), int(offsets[last]))
+
+    blocks = _rating_blocks(year_index, year_range, rating_range)
+    if not blocks:
+        return slice(0, 0)
+    if all(blocks[i][1] == blocks[i + 1][0] for i in range(len(blocks) - 1)):
+        return slice(blocks[0][0], blocks[-1][1])
+    return np.concatenate([np.arange(low, high) for low, high in blocks])
+
+
+def count_year_rows(year_index, year_range, rating_range):
+    """Jumlah baris `year_rows` tanpa membuat array posisi (mis. untuk profil per bagian)."""
+    return sum(high - low for low, high in _rating_blocks(year_index, year_range, rating_range))
+
+
+def build_genre_index(dataset):
+    """
+    Indeks terbalik Genre_ID -> baris film, dibangun sekali dari bridge saat
+    dataset dimuat. Untuk setiap genre disimpan pasangan (baris film,
+    Director_ID) terurut per baris film ('pair_rows'/'pair_directors'; rentang
+    genre g = pair_offsets[g]:pair_offsets[g + 1]). 'director_counts' adalah
+    jumlah film per (genre, sutradara) tanpa filter, khusus film yang memiliki
+    rating, disimpan sebagai kunci genre * n_directors + Director_ID terurut.
+    'rating_bounds' adalah rating terkecil dan terbesar (None jika tidak ada
+    film berating), untuk mengenali filter rating yang mencakup semua film.
+    """
+    genre, director = dataset['bridge_genre'], dataset['bridge_director']
+    n_movies = len(dataset['movies'])
+    n_genres, n_directors = len(genre['names']), len(director['names'])
+
+    order = np.lexsort((genre['movie_pos'], genre['ids']))
+    genre_ids, movie_rows = genre['ids'][order], genre['movie_pos'][order].astype(np.int64)
+
+    # Sutradara per film dalam bentuk CSR: baris film -> rentang di `directors`
+    order = np.argsort(director['movie_pos'], kind='stable')
+    directors = director['ids'][order]
+    director_offsets = np.searchsorted(director['movie_pos'][order], np.arange(n_movies + 1))
+
+    # Setiap (genre, film) diperluas menjadi satu pasangan per sutradara film tersebut
+    per_movie = director_offsets[movie_rows + 1] - director_offsets[movie_rows]
+    ends = np.cumsum(per_movie)
+    gather = np.repeat(director_offsets[movie_rows] - ends + per_movie, per_movie) + np.arange(ends[-1] if len(ends) else 0)
+    pair_genres = np.repeat(genre_ids, per_movie)
+    pair_rows = np.repeat(movie_rows, per_movie)
+    pair_directors = directors[gather]
+
+    ratings = dataset['year_index']['ratings']
+    rated = ~np.isnan(ratings[pair_rows])
+    keys, counts = np.unique(pair_genres[rated].astype(np.int64) * n_directors + pair_directors[rated], return_counts=True)
+    rated_ratings = ratings[~np.isnan(ratings)]
+    return {
+        'genre_ids': {name: genre_id for genre_id, name in enumerate(genre['names']) if name is not None},
+        'pair_rows': pair_rows,
+        'pair_directors': pair_directors,
+        'pair_offsets': np.searchsorted(pair_genres, np.arange(n_genres + 1)),
+        'director_counts': (keys, counts),
+        'n_directors': n_directors,
+        'rating_bounds': (rated_ratings.min(), rated_ratings.max()) if len(rated_ratings) else None,
+    }
+
+
+def top_directors_by_genre(dataset, genre_index, genre_name, year_range, rating_range, n=5):
+    """
+    N sutradara dengan film terbanyak pada satu genre di dalam filter tahun +
+    rating, dari indeks terbalik (tanpa memindai string). Jika imbang,
+    Director_ID terkecil didahulukan. Mengembalikan Series jumlah film per nama.
+    """
+    names = dataset['bridge_director']['names']
+    genre_id = genre_index['genre_ids'].get(genre_name)
+    if genre_id is None:
+        return pd.Series(dtype='int64')
+    n_directors = genre_index['n_directors']
+
+    year_index = dataset['year_index']
+    window = year_rows(year_index, year_range)
+    ratings = year_index['ratings']
+    bounds = genre_index['rating_bounds']
+    low, high = ratings.dtype.type(rating_range[0]), ratings.dtype.type(rating_range[1])
+    if window == slice(0, len(ratings)) and (bounds is None or (low <= bounds[0] and high >= bounds[1])):
+        # Tanpa filter efektif: pakai jumlah (genre, sutradara) yang sudah dihitung saat load
+        keys, counts = genre_index['director_counts']
+        start, stop = np.searchsorted(keys, [genre_id * n_directors, (genre_id + 1) * n_directors])
+        director_ids, counts = keys[start:stop] - genre_id * n_directors, counts[start:stop]
+    else:
+        start, stop = genre_index['pair_offsets'][genre_id], genre_index['pair_offsets'][genre_id + 1]
+        rows = genre_index['pair_rows'][start:stop]
+        # Baris terurut naik, jadi rentang tahun = satu potongan berurutan di dalam genre ini
+        first, last = np.searchsorted(rows, [window.start, window.stop])
+        rows, directors = rows[first:last], genre_index['pair_directors'][start:stop][first:last]
+        keep = (ratings[rows] >= low) & (ratings[rows] <= high)
+        counts = np.bincount(directors[keep], minlength=n_directors)
+        director_ids = np.flatnonzero(counts)
+        counts = counts[director_ids]
+
+    top = np.lexsort((director_ids, -counts))[:n]
+    return pd.Series(counts[top], index=names[director_ids[top]])
+
+
+def _selected_pairs(dataset, bridge_name, rows):
+    """Pasangan bridge milik baris film terpilih (`rows` = label RangeIndex dari `movies`)."""
+    bridge = dataset[bridge_name]
+    selected = np.zeros(len(dataset['movies']), dtype=bool)
+    selected[np.asarray(rows, dtype=np.int64)] = True
+    keep = selected[bridge['movie_pos']]
+    return bridge['movie_pos'][keep], bridge['ids'][keep]
+
+
+def value_counts(dataset, bridge_name, rows):
+    """Jumlah film per nama genre/sutradara untuk baris terpilih, terurut menurun."""
+    _, ids = _selected_pairs(dataset, bridge_name, rows)
+    names = dataset[bridge_name]['names']
+    counts = np.bincount(ids, minlength=len(names))
+    present = np.flatnonzero(counts)
+    return pd.Series(counts[present], index=names[present]).sort_values(ascending=False, kind='stable')
+
+
+def popular_genres(dataset, rows, n=3):
+    """Genre paling sering muncul (modus); maksimal `n` nama jika imbang, urut alfabet."""
+    counts = value_counts(dataset, 'bridge_genre', rows)
+    if counts.empty:
+        return "N/A"
+    return ", ".join(sorted(counts[counts == counts.iloc[0]].index)[:n])
+
+
+def with_names(dataset, movies, plots=None):
+    """
+    Menambahkan kolom teks 'Genres' dan 'Directors' ('a, b') hanya untuk baris
+    `movies` yang akan ditampilkan (mis. tabel data mentah), serta kolom
+    'Plot' jika `plots` (hasil `load_plots`) diberikan.
+    """
+    result = movies.copy()
+    if plots is not None:
+        result.insert(result.columns.get_loc('Runtime') + 1, 'Plot', plots.iloc[movies.index].to_numpy())
+    for bridge_name, column in (('bridge_genre', 'Genres'), ('bridge_director', 'Directors')):
+        positions, ids = _selected_pairs(dataset, bridge_name, movies.index)
+        names = pd.Series(dataset[bridge_name]['names'][ids], index=positions)
+        result[column] = names.groupby(level=0).agg(', '.join).reindex(movies.index)
+    return result
@@ -0,0 +1,361 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import inspect
+
+from normalize import NAME_CACHE_PATH, NameNormalizer, encode_multi_valued
+from profiling import Profiler, peak_rss_mb, reset_peak_rss
+
+# ============================================================================
+# PROSES ETL: CSV -> TABEL DIMENSI, BRIDGE, DAN FAKTA
+# ============================================================================
+
+SOURCE_CSV = 'Top_10000_Movies_IMDb_with_Time.csv'
+
+# Kolom sumber yang ikut dihitung dalam hash konten per film
+SOURCE_COLUMNS = [
+    'ID', 'Movie Name', 'Runtime', 'Plot', 'Link', 'Directors', 'Stars',
+    'Genre', 'Time', 'Rating', 'Metascore', 'Votes', 'Gross'
+]
+
+# Tipe data eksplisit untuk kolom sumber (sama untuk mode penuh maupun per chunk)
+SOURCE_DTYPES = {
+    'ID': 'int64', 'Movie Name': 'string', 'Runtime': 'string', 'Plot': 'string',
+    'Link': 'string', 'Directors': 'string', 'Stars': 'string', 'Genre': 'string',
+    'Time': 'Int64', 'Rating': 'float64', 'Metascore': 'float64', 'Votes': 'Int64',
+    'Gross': 'float64'
+}
+
+# Tabel yang menyimpan hash konten terakhir dari setiap Movie_ID
+STATE_TABLE = 'etl_movie_state'
+
+# Tabel yang barisnya dimiliki oleh satu film (dihapus lalu ditulis ulang saat film berubah)
+MOVIE_TABLES = ['dim_movie', 'bridge_director', 'bridge_star', 'bridge_genre', 'fact_movie', STATE_TABLE]
+
+# Tabel dimensi yang hanya bertambah (surrogate key tidak pernah diubah)
+DIMENSION_COLUMNS = {
+    'dim_director': ('Director_Name', 'Director_ID'),
+    'dim_star': ('Star_Name', 'Star_ID'),
+    'dim_genre': ('Genre_Name', 'Genre_ID'),
+    'dim_time': ('Year', 'Time_ID'),
+}
+DIMENSION_TABLES = list(DIMENSION_COLUMNS)
+
+# (kolom sumber, tabel dimensi, tabel bridge, bersihkan nama?)
+MULTI_VALUED_DIMENSIONS = [
+    ('Directors', 'dim_director', 'bridge_director', True),
+    ('Stars', 'dim_star', 'bridge_star', True),
+    ('Genre', 'dim_genre', 'bridge_genre', False),
+]
+
+
+def compute_row_hash(df):
+    """Menghitung hash konten (int64) untuk setiap baris sumber."""
+    hashes = pd.util.hash_pandas_object(df[SOURCE_COLUMNS], index=False)
+    return pd.Series(hashes.to_numpy().view('int64'), index=df.index)
+
+
+class DimensionEncoder:
+    """
+    Memberi surrogate key pada nilai dimensi secara bertahap (per chunk).
+    ID diberikan berurutan sesuai kemunculan pertama; jika `existing`
+    diberikan, ID lama dipertahankan dan nilai baru diberi ID lanjutan.
+    """
+
+    def __init__(self, name_col, id_col, existing=None):
+        self.name_col = name_col
+        self.id_col = id_col
+        self._ids = {}
+        self._new_names = []
+        self._dtype = existing[name_col].dtype if existing is not None else 'object'
+        if existing is not None and not existing.empty:
+            self._ids = dict(zip(existing[name_col], existing[id_col].astype('int64')))
+        self._next_id = max(self._ids.values(), default=0) + 1
+
+    def encode(self, values):
+        """Mengembalikan Series ID untuk `values`, menambahkan nilai yang belum dikenal."""
+        self._dtype = values.dtype
+        ids = values.map(self._ids)
+        unknown = ids.isna()
+        if unknown.any():
+            self.register(pd.unique(values[unknown]))
+            ids[unknown] = values[unknown].map(self._ids)
+        return ids.astype('int64')
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def new_count(self):
+        return len(self._new_names)
+
+    def new_names_since(self, count):
+        """Nama baru (berurutan sesuai ID) yang ditambahkan setelah `count` nama baru pertama."""
+        return self._new_names[count:]
+
+    def register(self, names, dtype=None):
+        """Menambahkan nama yang sudah diberi ID berurutan oleh encoder lain (mis. di worker)."""
+        if dtype is not None:
+            self._dtype = dtype
+        for name in names:
+            self._ids[name] = self._next_id
+            self._new_names.append(name)
+            self._next_id += 1
+
+    def new_rows(self):
+        """Baris dimensi yang ditambahkan sejak encoder dibuat."""
+        names = pd.Series(self._new_names, dtype=self._dtype, name=self.name_col)
+        first_id = self._next_id - len(self._new_names)
+        return pd.DataFrame({self.name_col: names, self.id_col: range(first_id, self._next_id)})
+
+
+def has_etl_state(engine):
+    """
+    True jika database sudah berisi state ETL dan semua tabel yang disentuh
+    muatan inkremental. Jika False, mode inkremental kembali ke muatan penuh
+    (dipakai bersama oleh ETL dan loader agar keduanya mengambil keputusan sama).
+    """
+    inspector = inspect(engine)
+    return all(inspector.has_table(name) for name in DIMENSION_TABLES + MOVIE_TABLES)
+
+
+def _read_existing_tables(engine):
+    """Membaca state ETL sebelumnya. Mengembalikan None jika belum pernah ada muatan."""
+    if not has_etl_state(engine):
+        return None
+    existing = {name: pd.read_sql_table(name, con=engine) for name in DIMENSION_TABLES}
+    existing[STATE_TABLE] = pd.read_sql_table(STATE_TABLE, con=engine)
+    return existing
+
+
+def _first_occurrences(ids, seen):
+    """
+    Menandai baris yang Movie_ID-nya belum pernah muncul (di chunk ini maupun
+    chunk sebelumnya). `seen` adalah bitmap numpy yang diperbesar bila perlu,
+    sehingga memori sebanding dengan ID terbesar, bukan dengan jumlah baris.
+    """
+    values = ids.to_numpy()
+    if len(values) and values.max() >= len(seen):
+        seen = np.concatenate([seen, np.zeros(values.max() + 1 - len(seen), dtype=bool)])
+    mask = ~seen[values] & ~ids.duplicated().to_numpy()
+    seen[values] = True
+    return mask, seen
+
+
+def _read_source(csv_path, chunksize=None, usecols=SOURCE_COLUMNS):
+    """Membaca CSV sumber dengan dtype eksplisit; menghasilkan iterator chunk bila `chunksize` diisi."""
+    dtype = {name: SOURCE_DTYPES[name] for name in usecols}
+    reader = pd.read_csv(csv_path, usecols=usecols, dtype=dtype, thousands=',', chunksize=chunksize)
+    return reader if chunksize else [reader]
+
+
+def _metascore_mode(csv_path, chunksize):
+    """Modus Metascore atas seluruh film unik, dihitung tanpa memuat seluruh file."""
+    counts = pd.Series(dtype='int64')
+    seen = np.zeros(0, dtype=bool)
+    for chunk in _read_source(csv_path, chunksize, usecols=['ID', 'Metascore']):
+        mask, seen = _first_occurrences(chunk['ID'], seen)
+        counts = counts.add(chunk.loc[mask, 'Metascore'].value_counts(), fill_value=0)
+    # Sama seperti Series.mode(): jika imbang, nilai terkecil yang dipakai
+    return counts[counts == counts.max()].index.min()
+
+
+def _stage_dim_movie(df, encoder, normalizer):
+    # --- 1. DIM MOVIE ---
+    dim_movie = df[['ID', 'Movie Name', 'Runtime', 'Plot', 'Link']].copy()
+    dim_movie.columns = ['Movie_ID', 'Movie_Name', 'Runtime', 'Plot', 'Link']
+    return {'dim_movie': dim_movie}
+
+
+def _stage_multi_valued(column, bridge_name, clean_names):
+    """Tahap 2-7: dimensi multi-nilai + bridge (Director, Star, Genre)."""
+    def stage(df, encoder, normalizer):
+        bridge = encode_multi_valued(df['ID'], df[column], encoder, normalizer if clean_names else None)
+        return {bridge_name: bridge}
+    return stage
+
+
+def _stage_fact_movie(df, encoder, normalizer):
+    # --- 8 & 9. DIM TIME + FACT MOVIE ---
+    fact_movie = df[['ID', 'Rating', 'Metascore', 'Votes', 'Gross', 'Time']].dropna(subset=['Time'])
+    fact_movie.columns = ['Movie_ID', 'Rating', 'Metascore', 'Votes', 'Gross', 'Year']
+    fact_movie.insert(1, 'Time_ID', encoder.encode(fact_movie['Year']))
+    return {'fact_movie': fact_movie[['Movie_ID', 'Time_ID', 'Rating', 'Metascore', 'Votes', 'Gross']]}
+
+
+# Tahap transformasi per chunk: nama -> (fungsi, kolom sumber yang dibaca, encoder dimensi)
+# Setiap tahap hanya bergantung pada kolomnya sendiri sehingga bisa dijalankan paralel.
+ETL_STAGES = {
+    'dim_movie': (_stage_dim_movie, ['ID', 'Movie Name', 'Runtime', 'Plot', 'Link'], None),
+    **{bridge_name: (_stage_multi_valued(column, bridge_name, clean_names), ['ID', column], dim_name)
+       for column, dim_name, bridge_name, clean_names in MULTI_VALUED_DIMENSIONS},
+    'fact_movie': (_stage_fact_movie, ['ID', 'Rating', 'Metascore', 'Votes', 'Gross', 'Time'], 'dim_time'),
+}
+
+# Chunk, encoder, dan normalizer yang sedang diproses; diwarisi proses worker lewat fork
+# sehingga DataFrame sumber tidak perlu di-pickle ke setiap worker.
+_SHARED_STAGE_INPUT = None
+
+
+def _run_stage(stage_name, df=None, encoder=None, normalizer=None):
+    """
+    Menjalankan satu tahap ETL. Di worker hasil fork, `df`, `encoder`, dan
+    `normalizer` diambil dari `_SHARED_STAGE_INPUT`. Mengembalikan tabel
+    hasil, nama dimensi baru (berurutan sesuai ID), entri cache normalisasi
+    baru, durasi tahap, dan puncak RSS proses selama tahap (MB).
+    """
+    reset_peak_rss()
+    started = time.perf_counter()
+    function, _, dim_name = ETL_STAGES[stage_name]
+    if df is None:
+        df, encoders, normalizer = _SHARED_STAGE_INPUT
+        encoder = encoders.get(dim_name)
+    mark = encoder.new_count if encoder is not None else 0
+    tables = function(df, encoder, normalizer)
+    added = (encoder.new_names_since(mark), encoder.dtype) if encoder is not None else None
+    cache_entries = normalizer.drain() if normalizer is not None else {}
+    return tables, added, cache_entries, time.perf_counter() - started, peak_rss_mb()
+
+
+def _transform_chunk(df, encoders, normalizer, profiler, parallel=False):
+    """
+    Mengubah satu potong data sumber menjadi baris tabel per film. Jika
+    `parallel`, setiap tahap dijalankan di process pool; hasilnya identik
+    dengan jalur berurutan karena ID dimensi baru (dan cache normalisasi)
+    disinkronkan kembali ke encoder induk sesuai urutan yang diberikan worker.
+    """
+    # --- 10. STATE ETL (hash konten per film) ---
+    movie_state = df[['ID', 'Row_Hash']].copy()
+    movie_state.columns = ['Movie_ID', 'Row_Hash']
+    stage_encoders = {name: encoders.get(dim_name) for name, (_, _, dim_name) in ETL_STAGES.items()}
+
+    if not parallel:
+        results = {name: _run_stage(name, df, stage_encoders[name], normalizer) for name in ETL_STAGES}
+    else:
+        global _SHARED_STAGE_INPUT
+        if 'fork' in multiprocessing.get_all_start_methods():
+            _SHARED_STAGE_INPUT = (df, encoders, normalizer)
+            context, arguments = multiprocessing.get_context('fork'), {name: () for name in ETL_STAGES}
+        else:
+            # Tanpa fork, kirim hanya kolom yang dipakai tiap tahap, bukan seluruh DataFrame
+            context = multiprocessing.get_context()
+            arguments = {name: (df[columns], stage_encoders[name], normalizer)
+                         for name, (_, columns, _) in ETL_STAGES.items()}
+        try:
+            with ProcessPoolExecutor(max_workers=len(ETL_STAGES), mp_context=context) as pool:
+                futures = {name: pool.submit(_run_stage, name, *arguments[name]) for name in ETL_STAGES}
+                results = {name: future.result() for name, future in futures.items()}
+        finally:
+            _SHARED_STAGE_INPUT = None
+        for name, (_, added, cache_entries, _, _) in results.items():
+            if added is not None:
+                stage_encoders[name].register(*added)
+            normalizer.update(cache_entries)
+
+    tables = {}
+    for name, (stage_tables, _, _, elapsed, peak_mb) in results.items():
+        profiler.add(name, elapsed, len(df), sum(len(table) for table in stage_tables.values()), peak_mb)
+        tables.update(stage_tables)
+    # State ETL selalu didahulukan agar loader inkremental bisa menghapus baris lama lebih dulu
+    return {STATE_TABLE: movie_state, **tables}
+
+
+def _prepared_chunks(csv_path, chunksize, previous_hash, metascore_mode, profiler):
+    """
+    Membaca CSV (per chunk bila `chunksize`) dan menyiapkan setiap potong:
+    duplikat Movie_ID dibuang, hash konten dihitung, Metascore kosong diisi
+    modus, dan pada mode inkremental hanya film baru/berubah yang diteruskan.
+    """
+    seen = np.zeros(0, dtype=bool)
+    chunks = None
+    while True:
+        with profiler.stage('source') as record:
+            if chunks is None:
+                # Load dataset dari file CSV (FileNotFoundError diteruskan ke pemanggil)
+                chunks = iter(_read_source(csv_path, chunksize))
+            df = next(chunks, None)
+            if df is None:
+                return
+            record['rows_in'] = len(df)
+            # Movie_ID adalah primary key; kemunculan pertama yang dipakai
+            mask, seen = _first_occurrences(df['ID'], seen)
+            df = df[mask].copy()
+            df['Row_Hash'] = compute_row_hash(df)
+            if metascore_mode is None:
+                metascore_mode = df['Metascore'].mode().iloc[0]
+            df['Metascore'] = df['Metascore'].fillna(metascore_mode)
+
+            if previous_hash is not None:
+                known_hash = df['ID'].map(previous_hash)
+                df = df[known_hash.isna() | (known_hash != df['Row_Hash'])]
+            record['rows_out'] = len(df)
+        yield df
+
+
+def iter_etl_process(csv_path=SOURCE_CSV, engine=None, incremental=False, chunksize=None,
+                     parallel=False, progress=None, name_cache=NAME_CACHE_PATH, profiler=None):
+    """
+    Menjalankan ETL dan menghasilkan pasangan (nama_tabel, DataFrame) satu per
+    satu. Jika `chunksize` diisi, CSV dibaca per potong sehingga puncak memori
+    sebanding dengan ukuran chunk, bukan ukuran dataset: tabel per film
+    dikirim per chunk, sedangkan tabel dimensi dikirim sekali di akhir.
+
+    Pada mode `incremental`, hanya film yang baru atau berubah (berdasarkan
+    Movie_ID dan hash konten) yang diproses. Dimensi hanya berisi baris baru
+    dengan surrogate key lanjutan, sedangkan tabel per film hanya berisi baris
+    untuk film yang terdampak. Jika database belum berisi state ETL, proses
+    otomatis kembali ke muatan penuh.
+
+    Jika `parallel`, tahap dim_movie, director, star, genre, dan time/fact
+    dijalankan bersamaan di process pool. Waktu, baris masuk/keluar, dan
+    puncak memori per tahap dicatat di `profiler` (lihat `profiling.Profiler`)
+    dan ringkasannya dikirim ke `progress` di akhir proses.
+
+    Nama sutradara dan pemeran dinormalisasi lewat `NameNormalizer` yang
+    cache-nya disimpan di `name_cache` (None = tanpa cache di disk).
+    """
+    started = time.perf_counter()
+    profiler = profiler if profiler is not None else Profiler('etl', log_path=None)
+    existing = _read_existing_tables(engine) if incremental and engine is not None else None
+    previous_hash = existing[STATE_TABLE].set_index('Movie_ID')['Row_Hash'] if existing else None
+    existing = existing or {}
+    encoders = {name: DimensionEncoder(name_col, id_col, existing.get(name))
+                for name, (name_col, id_col) in DIMENSION_COLUMNS.items()}
+
+    # Modus Metascore dihitung dari seluruh data agar konsisten antar-run
+    metascore_mode = _metascore_mode(csv_path, chunksize) if chunksize else None
+    normalizer = NameNormalizer.load(name_cache)
+
+    for df in _prepared_chunks(csv_path, chunksize, previous_hash, metascore_mode, profiler):
+        yield from _transform_chunk(df, encoders, normalizer, profiler, parallel).items()
+
+    for name, encoder in encoders.items():
+        yield name, encoder.new_rows()
+    normalizer.save()
+
+    if progress is not None:
+        # Profiler bisa dipakai bersama loader; hanya tahap ETL yang diringkas di sini
+        for line in profiler.summary_lines(['source', *ETL_STAGES]):
+            progress(line)
+        progress(f"  ⏱ Total ETL ({'paralel' if parallel else 'berurutan'}): {time.perf_counter() - started:.2f} dtk")
+
+
+def run_etl_process(csv_path=SOURCE_CSV, engine=None, incremental=False, chunksize=None,
+                    parallel=False, progress=None, name_cache=NAME_CACHE_PATH, profiler=None):
+    """
+    Fungsi ini menjalankan seluruh proses ETL dari file CSV.
+    Membaca file, melakukan transformasi, dan menghasilkan semua DataFrame
+    yang siap untuk dimuat ke database (lihat `iter_etl_process` untuk mode
+    inkremental, streaming per chunk, dan paralel).
+    """
+    pieces = {}
+    for table_name, df in iter_etl_process(csv_path, engine, incremental, chunksize,
+                                           parallel, progress, name_cache, profiler):
+        pieces.setdefault(table_name, []).append(df)
+    # Mengembalikan semua dataframe dalam sebuah dictionary
+    return {name: frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            for name, frames in pieces.items()}
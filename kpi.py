@@ -0,0 +1,159 @@
+from decimal import Decimal
+
+import numpy as np
+
+from dataset import year_rows
+
+# ============================================================================
+# MESIN KPI "STATISTIK UTAMA" BERBASIS PREFIX SUM
+# ============================================================================
+# Film dikelompokkan ke sel (tahun, rating unik). Untuk setiap sel disimpan
+# jumlah film, total pendapatan, total rating, dan jumlah film per genre,
+# lalu diakumulasikan sepanjang sumbu tahun. Rentang tahun apa pun cukup
+# dijawab dengan selisih dua baris prefix (ditambah pemilihan kolom rating),
+# sehingga biayanya bergantung pada jumlah tahun/rating unik, bukan jumlah film.
+
+
+def _decimal_values(ratings):
+    """
+    Nilai rating unik dalam float64 seperti aslinya di database: rating
+    disimpan sebagai float32, jadi 7.1 dikembalikan ke 7.1 (bukan 7.0999999).
+    """
+    return np.array([float(str(value)) for value in ratings], dtype=np.float64)
+
+
+def build_kpi_index(dataset):
+    """
+    Membangun array prefix per tahun dari dataset yang terurut per (Year,
+    Rating, Movie_ID) (lihat `load_movie_dataset`). Kolom rating terakhir
+    menampung film tanpa rating.
+    """
+    movies, year_index = dataset['movies'], dataset['year_index']
+    ratings = movies['Rating'].to_numpy()
+    rated = ~np.isnan(ratings)
+    rating_values = np.unique(ratings[rated])
+    n_years, n_ratings = len(year_index['years']), len(rating_values) + 1
+
+    year_pos = np.repeat(np.arange(n_years), np.diff(year_index['offsets']))
+    rating_pos = np.where(rated, np.searchsorted(rating_values, ratings), n_ratings - 1)
+    cell = year_pos * n_ratings + rating_pos
+    n_cells = n_years * n_ratings
+
+    def prefix(values):
+        grid = values.reshape(n_years, n_ratings, *values.shape[1:])
+        zeros = np.zeros((1,) + grid.shape[1:], dtype=grid.dtype)
+        return np.concatenate([zeros, np.cumsum(grid, axis=0)])
+
+    counts = np.bincount(cell, minlength=n_cells)
+    gross = np.bincount(cell, weights=movies['Gross'].to_numpy(dtype=np.float64), minlength=n_cells)
+
+    genre_bridge = dataset['bridge_genre']
+    n_genres = len(genre_bridge['names'])
+    genre_counts = np.bincount(cell[genre_bridge['movie_pos']] * n_genres + genre_bridge['ids'],
+                               minlength=n_cells * n_genres).reshape(n_cells, n_genres)
+
+    # Baris pertama setiap sel = Movie_ID terkecil, karena data terurut per (Year, Rating, Movie_ID)
+    first_row = np.full(n_cells, -1, dtype=np.int64)
+    starts = np.flatnonzero(np.r_[True, cell[1:] != cell[:-1]]) if len(cell) else np.array([], dtype=np.int64)
+    first_row[cell[starts]] = starts
+
+    return {
+        'years': year_index['years'],
+        'rating_keys': rating_values,
+        'rating_values': _decimal_values(rating_values),
+        'rating_decimals': [Decimal(str(value)) for value in _decimal_values(rating_values)],
+        'year_index': year_index,
+        'count': prefix(counts),
+        'gross': prefix(gross),
+        'genre_count': prefix(genre_counts.astype(np.int32)),
+        'first_row': first_row.reshape(n_years, n_ratings),
+        'movie_id': movies['Movie_ID'].to_numpy(),
+        'runtime': movies['Runtime'].to_numpy(),
+        'genre_names': genre_bridge['names'],
+    }
+
+
+def _legacy_rating_sum(kpi_index, year_range, rating_range):
+    """
+    Jumlah rating film periode ini persis seperti Series.sum() dashboard lama:
+    nilai float64 asli dalam urutan Movie_ID, NaN diganti 0, dijumlahkan
+    numpy (pairwise). Memindai film periode, jadi hanya dipakai saat rata-rata
+    eksak jatuh tepat di batas pembulatan.
+    """
+    rows = year_rows(kpi_index['year_index'], year_range, rating_range)
+    order = np.argsort(kpi_index['movie_id'][rows], kind='stable')
+    ratings = kpi_index['year_index']['ratings'][rows][order]
+    rated = ~np.isnan(ratings)
+    positions = np.searchsorted(kpi_index['rating_keys'], ratings[rated])
+    values = np.zeros(len(ratings), dtype=np.float64)
+    values[rated] = kpi_index['rating_values'][positions]
+    return float(values.sum())
+
+
+def _period_kpis(kpi_index, year_range, rating_range):
+    """Enam metrik KPI untuk satu periode; `rating_range` None = semua film (termasuk tanpa rating)."""
+    years = kpi_index['years']
+    first = np.searchsorted(years, year_range[0], side='left')
+    last = np.searchsorted(years, year_range[1], side='right')
+
+    rating_keys = kpi_index['rating_keys']
+    if rating_range is None:
+        low, high, with_unrated = 0, len(rating_keys), True
+    else:
+        bounds = rating_keys.dtype.type(rating_range[0]), rating_keys.dtype.type(rating_range[1])
+        low = np.searchsorted(rating_keys, bounds[0], side='left')
+        high = np.searchsorted(rating_keys, bounds[1], side='right')
+        with_unrated = False
+    stop = len(rating_keys) + 1 if with_unrated else high
+
+    counts = (kpi_index['count'][last] - kpi_index['count'][first])[low:stop]
+    total = int(counts.sum())
+    if total == 0:
+        return {'count': 0, 'avg_rating': 0, 'max_rating': 0, 'gross': 0.0,
+                'optimal_runtime': 0, 'popular_genre': "N/A"}
+
+    gross = (kpi_index['gross'][last] - kpi_index['gross'][first])[low:stop].sum()
+    rated_counts = counts[:high - low]
+    rated = int(rated_counts.sum())
+    values = kpi_index['rating_values'][low:high]
+    if rated:
+        # Sama dengan round(Series.mean(), 2) dashboard lama: jumlah rating dihitung eksak
+        # (Decimal per rating unik), dibagi seperti pandas, lalu dibulatkan dengan np.round
+        rating_sum = sum(decimal * int(count) for decimal, count in zip(kpi_index['rating_decimals'][low:high], rated_counts)
+                         if count)
+        if (rating_sum * 200 / rated) % 2 == 1:
+            # Rata-rata eksak tepat di x.xx5: hasil pandas ditentukan galat penjumlahan float-nya
+            rating_sum = _legacy_rating_sum(kpi_index, year_range, rating_range)
+        avg_rating = float(np.round(float(rating_sum) / rated, 2))
+        top = int(np.flatnonzero(rated_counts)[-1])
+        max_rating = round(float(values[top]), 1)
+        # Rating tertinggi imbang: pilih Movie_ID terkecil di antara tahun-tahun dalam rentang
+        rows = kpi_index['first_row'][first:last, low + top]
+        rows = rows[rows >= 0]
+        optimal_runtime = int(kpi_index['runtime'][rows[np.argmin(kpi_index['movie_id'][rows])]])
+    else:
+        avg_rating, max_rating, optimal_runtime = float('nan'), float('nan'), 0
+
+    genre_counts = (kpi_index['genre_count'][last] - kpi_index['genre_count'][first])[low:stop].sum(axis=0)
+    return {'count': total, 'avg_rating': avg_rating, 'max_rating': max_rating, 'gross': float(gross),
+            'optimal_runtime': optimal_runtime,
+            'popular_genre': _popular_genre(genre_counts, kpi_index['genre_names'])}
+
+
+def _popular_genre(genre_counts, names, n=3):
+    """Sama dengan `dataset.popular_genres`: modus, maksimal `n` nama jika imbang, urut alfabet."""
+    best = genre_counts.max() if len(genre_counts) else 0
+    if best == 0:
+        return "N/A"
+    return ", ".join(sorted(names[np.flatnonzero(genre_counts == best)])[:n])
+
+
+def period_kpis(kpi_index, year_range, rating_range):
+    """
+    KPI periode terpilih (filter tahun + rating) dan periode sebelumnya
+    (rentang tahun sepanjang periode terpilih tepat sebelum tahun awalnya,
+    tanpa filter rating). Mengembalikan (kpi_sekarang, kpi_sebelumnya).
+    """
+    duration = year_range[1] - year_range[0]
+    previous_range = (year_range[0] - 1 - duration, year_range[0] - 1)
+    return _period_kpis(kpi_index, year_range, rating_range), _period_kpis(kpi_index, previous_range, None)
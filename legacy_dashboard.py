@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# DASHBOARD LAMA SEBAGAI PEMBANDING
+# ============================================================================
+# Pemuatan dan perhitungan dashboard sebelum indeks tahun, rollup, dan prefix
+# sum, disalin apa adanya. Dipakai benchmark.py untuk mengukur percepatan dan
+# tests/test_kpi.py untuk memastikan hasil dashboard baru tetap sama.
+
+# Kueri lama dashboard (subkueri GROUP_CONCAT berkorelasi per film), versi SQLite
+LEGACY_MOVIES_QUERY = """
+SELECT dm.Movie_ID, dm.Movie_Name, dm.Runtime, dm.Plot, dt.Year,
+       fm.Rating, fm.Metascore, fm.Votes, fm.Gross,
+       (SELECT GROUP_CONCAT(g.Genre_Name, ', ')
+        FROM bridge_genre bg JOIN dim_genre g ON bg.Genre_ID = g.Genre_ID
+        WHERE bg.Movie_ID = dm.Movie_ID) AS Genres,
+       (SELECT GROUP_CONCAT(d.Director_Name, ', ')
+        FROM bridge_director bd JOIN dim_director d ON bd.Director_ID = d.Director_ID
+        WHERE bd.Movie_ID = dm.Movie_ID) AS Directors
+FROM fact_movie fm
+JOIN dim_movie dm ON fm.Movie_ID = dm.Movie_ID
+JOIN dim_time dt ON fm.Time_ID = dt.Time_ID
+"""
+
+
+def load_legacy_movies(engine):
+    """Frame film dashboard lama: satu baris per film, genre dan sutradara sebagai string."""
+    df = pd.read_sql(LEGACY_MOVIES_QUERY, con=engine)
+    df['Votes'] = pd.to_numeric(df['Votes'], errors='coerce').fillna(0)
+    df['Gross'] = pd.to_numeric(df['Gross'], errors='coerce').fillna(0)
+    df['Runtime'] = pd.to_numeric(df['Runtime'].astype(str).str.replace(' min', '', regex=False),
+                                  errors='coerce').fillna(0).astype(int)
+    return df
+
+
+def legacy_render(df, year_range, rating_range):
+    """Komputasi data per rerun pada dashboard lama (string split/explode)."""
+    filtered = df[df['Year'].between(*year_range) & df['Rating'].between(*rating_range)].copy()
+    previous = df[df['Year'].between(year_range[0] - 1 - (year_range[1] - year_range[0]), year_range[0] - 1)]
+    for frame in (filtered, previous):
+        genres = frame['Genres'].dropna().str.split(', ').explode()
+        ", ".join(genres.mode().head(3))
+    filtered.groupby('Year')['Gross'].sum()
+    filtered.groupby('Year')['Rating'].mean()
+    exploded = filtered.dropna(subset=['Genres']).copy()
+    exploded['Genres'] = exploded['Genres'].str.split(', ')
+    exploded = exploded.explode('Genres')
+    exploded['Genres'].value_counts()
+    exploded.groupby('Genres')['Gross'].sum().nlargest(10)
+    genre_df = filtered[filtered['Genres'].str.contains('Drama', na=False)].copy()
+    genre_df['Directors'] = genre_df['Directors'].str.split(', ')
+    genre_df.explode('Directors')['Directors'].value_counts().nlargest(5)
+
+
+def legacy_kpis(df_movies, year_range, rating_range):
+    """
+    KPI "Statistik Utama" persis seperti dashboard lama (filter boolean,
+    idxmax, explode + mode) atas frame dari `load_legacy_movies`, dalam bentuk
+    hasil `period_kpis`: (kpi_sekarang, kpi_sebelumnya).
+    """
+    filtered_df = df_movies[
+        (df_movies['Year'] >= year_range[0]) & (df_movies['Year'] <= year_range[1]) &
+        (df_movies['Rating'] >= rating_range[0]) & (df_movies['Rating'] <= rating_range[1])
+    ].copy()
+    current_duration = year_range[1] - year_range[0]
+    previous_year_end = year_range[0] - 1
+    previous_year_start = previous_year_end - current_duration
+    previous_period_df = df_movies[
+        (df_movies['Year'] >= previous_year_start) & (df_movies['Year'] <= previous_year_end)
+    ]
+
+    periods = []
+    for period_df in (filtered_df, previous_period_df):
+        optimal_runtime = 0
+        if not period_df.empty:
+            optimal_runtime = period_df.loc[period_df['Rating'].idxmax()]['Runtime']
+        popular_genre = "N/A"
+        if not period_df.empty and period_df['Genres'].notna().any():
+            genres = period_df['Genres'].dropna().str.split(', ').explode()
+            popular_genre = ", ".join(genres.mode().head(3))
+        periods.append({
+            'count': period_df.shape[0],
+            'avg_rating': round(period_df['Rating'].mean(), 2) if not period_df.empty else 0,
+            'max_rating': period_df['Rating'].max() if not period_df.empty else 0,
+            'gross': period_df['Gross'].sum(),
+            'optimal_runtime': optimal_runtime,
+            'popular_genre': popular_genre,
+        })
+    return tuple(periods)
+
+
+def random_kpi_windows(years, windows, seed=0):
+    """Rentang (tahun, rating) acak, termasuk yang sebagian/seluruhnya di luar data."""
+    rng = np.random.default_rng(seed)
+    for _ in range(windows):
+        year_range = tuple(sorted(int(year) for year in rng.integers(years[0] - 5, years[-1] + 5, 2)))
+        rating_range = tuple(sorted(round(float(value), 1) for value in rng.integers(0, 101, 2) / 10))
+        yield year_range, rating_range
@@ -0,0 +1,268 @@
+import csv
+import os
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import (BigInteger, Boolean, Column, DateTime, Double, Index, MetaData,
+                        PrimaryKeyConstraint, String, Table, Text, bindparam, text)
+
+from etl import MOVIE_TABLES, STATE_TABLE, has_etl_state
+from profiling import Profiler
+from rollups import RETIRED_ROLLUP_TABLES, ROLLUP_KEYS, ROLLUP_TABLES, empty_rollup_frame
+
+# ============================================================================
+# PEMUATAN KE DATABASE: STAGING -> SWAP ATOMIK
+# ============================================================================
+
+# Primary key dan index tambahan untuk setiap tabel gudang data
+TABLE_KEYS = {
+    'dim_movie': (['Movie_ID'], []),
+    'dim_director': (['Director_ID'], []),
+    'dim_star': (['Star_ID'], []),
+    'dim_genre': (['Genre_ID'], []),
+    'dim_time': (['Time_ID'], ['Year']),
+    'bridge_director': (['Movie_ID', 'Director_ID'], ['Director_ID']),
+    'bridge_star': (['Movie_ID', 'Star_ID'], ['Star_ID']),
+    'bridge_genre': (['Movie_ID', 'Genre_ID'], ['Genre_ID']),
+    'fact_movie': (['Movie_ID'], ['Time_ID']),
+    STATE_TABLE: (['Movie_ID'], []),
+    **ROLLUP_KEYS,
+}
+
+STAGING_SUFFIX = '__staging'
+OLD_SUFFIX = '__old'
+
+# Jumlah baris per batch INSERT (pymysql menulis ulang batch menjadi INSERT multi-baris)
+DEFAULT_CHUNKSIZE = 10_000
+
+
+def _column_type(series, is_key):
+    """Memetakan dtype pandas ke tipe kolom SQLAlchemy."""
+    kind = series.dtype.kind
+    if kind in 'iu':
+        return BigInteger()
+    if kind == 'f':
+        return Double()
+    if kind == 'b':
+        return Boolean()
+    if kind == 'M':
+        return DateTime()
+    # Kolom kunci butuh panjang tetap agar bisa di-index di MySQL
+    return String(255) if is_key else Text()
+
+
+def build_table(table_name, df, metadata=None, physical_name=None):
+    """
+    Membuat definisi tabel SQLAlchemy dari DataFrame, lengkap dengan
+    primary key dan index sesuai TABLE_KEYS.
+    """
+    primary_key, indexed = TABLE_KEYS.get(table_name, ([], []))
+    physical_name = physical_name or table_name
+    key_columns = set(primary_key) | set(indexed)
+    columns = [Column(name, _column_type(df[name], name in key_columns), nullable=name not in primary_key)
+               for name in df.columns]
+    constraints = [PrimaryKeyConstraint(*primary_key)] if primary_key else []
+    # Nama index diberi token unik karena di SQLite nama index berlaku global
+    token = uuid.uuid4().hex[:8]
+    indexes = [Index(f"ix_{table_name}_{name}_{token}", name) for name in indexed]
+    return Table(physical_name, metadata or MetaData(), *columns, *constraints, *indexes)
+
+
+def _records(df):
+    """Mengubah DataFrame menjadi list of dict dengan NaN -> None."""
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+def _insert_rows(conn, table, df, chunksize=None):
+    """INSERT per batch (chunk) agar memori dan ukuran kueri tetap terbatas."""
+    chunksize = chunksize or DEFAULT_CHUNKSIZE
+    for start in range(0, len(df), chunksize):
+        conn.execute(table.insert(), _records(df.iloc[start:start + chunksize]))
+
+
+def _supports_load_data(conn):
+    """LOAD DATA LOCAL INFILE hanya dipakai di MySQL yang mengizinkan local_infile."""
+    if conn.dialect.name != 'mysql':
+        return False
+    return str(conn.engine.url.query.get('local_infile', '')).lower() in ('1', 'true')
+
+
+def _write_load_data_csv(f, df):
+    """
+    Menulis DataFrame sebagai CSV untuk LOAD DATA dengan '\\' sebagai karakter
+    escape: nilai kosong ditulis sebagai \\N (dibaca MySQL sebagai NULL) dan
+    backslash di kolom teks digandakan agar tetap terbaca apa adanya.
+    """
+    text_columns = df.select_dtypes(include=['object', 'string']).columns
+    # fillna: nilai bukan string di kolom object dikembalikan apa adanya
+    escaped = df.assign(**{name: df[name].str.replace('\\', '\\\\', regex=False).fillna(df[name])
+                           for name in text_columns})
+    escaped.to_csv(f, index=False, header=False, na_rep='\\N', quoting=csv.QUOTE_MINIMAL)
+
+
+def _infile_path_literal(path):
+    """
+    Path file sebagai literal string SQL untuk LOAD DATA. Backslash (path
+    Windows) dibaca MySQL sebagai escape, jadi diganti garis miring yang juga
+    diterima Windows; kutip tunggal digandakan.
+    """
+    return "'" + path.replace('\\', '/').replace("'", "''") + "'"
+
+
+def _load_data_infile(conn, table, df):
+    """Memuat DataFrame melalui file CSV sementara dan LOAD DATA LOCAL INFILE."""
+    handle, path = tempfile.mkstemp(suffix='.csv')
+    try:
+        with os.fdopen(handle, 'w', newline='', encoding='utf-8') as f:
+            _write_load_data_csv(f, df)
+        columns = ', '.join(f"`{name}`" for name in df.columns)
+        conn.exec_driver_sql(
+            f"LOAD DATA LOCAL INFILE {_infile_path_literal(path)} INTO TABLE `{table.name}` CHARACTER SET utf8mb4 "
+            f"FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '\\\\' "
+            f"LINES TERMINATED BY '\\n' ({columns})"
+        )
+    finally:
+        os.remove(path)
+
+
+def _bulk_insert(conn, table, df, chunksize=None):
+    if _supports_load_data(conn):
+        _load_data_infile(conn, table, df)
+    else:
+        _insert_rows(conn, table, df, chunksize)
+
+
+def _drop_table(conn, name):
+    conn.exec_driver_sql(f"DROP TABLE IF EXISTS {conn.dialect.identifier_preparer.quote(name)}")
+
+
+def _swap_tables(conn, table_names):
+    """
+    Menukar semua tabel staging dengan tabel aktif dalam satu langkah atomik.
+    MySQL memakai satu perintah RENAME TABLE; dialek lain (mis. SQLite)
+    memakai DDL di dalam satu transaksi.
+    """
+    quote = conn.dialect.identifier_preparer.quote
+    existing = [name for name in table_names if conn.dialect.has_table(conn, name)]
+    if conn.dialect.name == 'mysql':
+        renames = [f"{quote(name)} TO {quote(name + OLD_SUFFIX)}" for name in existing]
+        renames += [f"{quote(name + STAGING_SUFFIX)} TO {quote(name)}" for name in table_names]
+        for name in existing:
+            _drop_table(conn, name + OLD_SUFFIX)
+        conn.exec_driver_sql("RENAME TABLE " + ", ".join(renames))
+        for name in existing:
+            _drop_table(conn, name + OLD_SUFFIX)
+        return
+
+    if conn.dialect.name == 'sqlite':
+        # pysqlite tidak membuka transaksi untuk DDL secara otomatis
+        conn.exec_driver_sql("BEGIN")
+    for name in existing:
+        _drop_table(conn, name)
+    for name in table_names:
+        conn.exec_driver_sql(f"ALTER TABLE {quote(name + STAGING_SUFFIX)} RENAME TO {quote(name)}")
+
+
+def _report(progress, table_name, rows, elapsed, action="dimuat"):
+    rate = rows / elapsed if elapsed > 0 else float('inf')
+    progress(f"  ✓ Tabel '{table_name}': {rows:,} baris {action} dalam {elapsed:.2f} dtk ({rate:,.0f} baris/dtk).")
+
+
+def _delete_movies(conn, table_name, movie_ids, batch_size=1000):
+    """Menghapus baris milik film tertentu, dalam batch agar kueri tidak terlalu panjang."""
+    statement = text(f"DELETE FROM {table_name} WHERE Movie_ID IN :ids").bindparams(
+        bindparam('ids', expanding=True))
+    for start in range(0, len(movie_ids), batch_size):
+        conn.execute(statement, {'ids': movie_ids[start:start + batch_size]})
+
+
+def load_to_mysql(engine, dataframes, incremental=False, progress=print, chunksize=None, profiler=None):
+    """
+    Fungsi ini mengambil dictionary of DataFrames (atau iterator pasangan
+    (nama_tabel, DataFrame) dari `iter_etl_process`) dan memuatnya ke MySQL.
+    Satu tabel boleh datang dalam beberapa potongan.
+
+    Muatan penuh ditulis ke tabel bayangan (`<tabel>__staging`) yang sudah
+    memiliki primary key dan index, lalu semua tabel ditukar sekaligus
+    sehingga dashboard tidak pernah melihat tabel yang setengah terisi.
+
+    Pada mode `incremental`, baris lama milik film yang terdampak dihapus lalu
+    diganti, dan baris dimensi baru ditambahkan, semuanya dalam satu transaksi.
+    Potongan `etl_movie_state` harus datang sebelum potongan lain milik film
+    yang sama. Jika database belum berisi state ETL (lihat `has_etl_state`),
+    ETL sudah menghasilkan tabel lengkap, jadi yang dijalankan adalah muatan penuh.
+
+    Waktu, jumlah baris, dan puncak memori per tabel dicatat di `profiler`
+    sebagai tahap 'load:<tabel>' (serta 'swap').
+    """
+    items = dataframes.items() if isinstance(dataframes, dict) else dataframes
+    profiler = profiler if profiler is not None else Profiler('load', log_path=None)
+    if incremental and not has_etl_state(engine):
+        progress("  ℹ State ETL belum ada di database: muatan inkremental dijalankan sebagai muatan penuh.")
+        incremental = False
+    tables = {}
+
+    with engine.begin() as conn:
+        for table_name, df in items:
+            with profiler.stage(f"load:{table_name}", rows_in=len(df)) as record:
+                if table_name not in tables:
+                    if incremental:
+                        tables[table_name] = build_table(table_name, df)
+                    else:
+                        staging = build_table(table_name, df, physical_name=table_name + STAGING_SUFFIX)
+                        _drop_table(conn, staging.name)
+                        staging.create(conn)
+                        tables[table_name] = staging
+                if incremental and table_name == STATE_TABLE:
+                    movie_ids = df['Movie_ID'].tolist()
+                    for movie_table in MOVIE_TABLES:
+                        _delete_movies(conn, movie_table, movie_ids)
+                _bulk_insert(conn, tables[table_name], df, chunksize)
+                record['rows_out'] = len(df)
+
+    measured = {stage['stage']: stage for stage in profiler.records()}
+    for table_name in tables:
+        stage = measured[f"load:{table_name}"]
+        _report(progress, table_name, stage['rows_out'], stage['seconds'],
+                "baru/diperbarui" if incremental else "dimuat")
+    if incremental:
+        return True
+
+    with profiler.stage('swap', rows_in=len(tables)), engine.connect() as conn:
+        _swap_tables(conn, list(tables))
+        conn.commit()
+    progress(f"  ✓ {len(tables)} tabel ditukar secara atomik.")
+    return True
+
+
+def materialize_rollups(engine, progress=print, profiler=None):
+    """
+    Membangun ulang tabel rollup (agg_*) dari tabel fakta dan bridge yang
+    sudah dimuat, dengan INSERT ... SELECT ... GROUP BY di database. Seperti
+    muatan penuh, hasilnya ditulis ke tabel staging lalu ditukar secara atomik.
+    Rollup lama yang tidak dipakai lagi (RETIRED_ROLLUP_TABLES) ikut dihapus.
+    Dipanggil setelah setiap muatan (penuh, streaming, maupun inkremental).
+    """
+    profiler = profiler if profiler is not None else Profiler('load', log_path=None)
+    with engine.begin() as conn:
+        quote = conn.dialect.identifier_preparer.quote
+        for table_name, (dtypes, query, _, _) in ROLLUP_TABLES.items():
+            started = time.perf_counter()
+            with profiler.stage(f"rollup:{table_name}") as record:
+                staging = build_table(table_name, empty_rollup_frame(table_name),
+                                      physical_name=table_name + STAGING_SUFFIX)
+                _drop_table(conn, staging.name)
+                staging.create(conn)
+                columns = ', '.join(quote(name) for name in dtypes)
+                result = conn.exec_driver_sql(f"INSERT INTO {quote(staging.name)} ({columns}) {query}")
+                record['rows_out'] = result.rowcount
+            _report(progress, table_name, result.rowcount, time.perf_counter() - started)
+
+    with profiler.stage('rollup:swap', rows_in=len(ROLLUP_TABLES)), engine.connect() as conn:
+        _swap_tables(conn, list(ROLLUP_TABLES))
+        for table_name in RETIRED_ROLLUP_TABLES:
+            _drop_table(conn, table_name)
+            _drop_table(conn, table_name + STAGING_SUFFIX)
+        conn.commit()
+    return True
@@ -0,0 +1,124 @@
+import json
+import os
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# NORMALISASI NAMA + DICTIONARY ENCODING UNTUK KOLOM MULTI-NILAI
+# ============================================================================
+
+NAME_CACHE_PATH = os.path.join('.etl_cache', 'name_normalization.json')
+
+# Naikkan jika aturan normalisasi berubah agar cache lama tidak dipakai
+NORMALIZATION_VERSION = 1
+
+# Karakter non-huruf yang tetap dipertahankan dalam nama
+_KEPT_PUNCTUATION = {'.', '-'}
+
+
+def normalize_name(raw):
+    """
+    Membersihkan satu nama orang: hanya huruf (termasuk non-ASCII seperti
+    'ö' atau 'ł'), tanda diakritik, spasi, titik, dan tanda hubung yang
+    dipertahankan, lalu spasi di ujung dibuang. Bentuk Unicode diseragamkan
+    ke NFC agar 'é' komposit dan 'e' + aksen dianggap sama.
+    """
+    text = unicodedata.normalize('NFC', raw)
+    kept = ''.join(ch for ch in text
+                   if ch.isspace() or ch in _KEPT_PUNCTUATION or unicodedata.category(ch)[0] in 'LM')
+    return kept.strip()
+
+
+class NameNormalizer:
+    """
+    Menormalisasi nama mentah dengan cache raw -> normal yang bisa disimpan
+    ke disk, sehingga setiap nama unik hanya dibersihkan sekali lintas run.
+    """
+
+    def __init__(self, cache=None, path=None):
+        self.path = path
+        self._cache = dict(cache or {})
+        self._added = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path=NAME_CACHE_PATH):
+        """Memuat cache dari `path`; cache kosong jika file belum ada atau versinya berbeda."""
+        if path is None or not os.path.exists(path):
+            return cls(path=path)
+        try:
+            with open(path, encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return cls(path=path)
+        if payload.get('version') != NORMALIZATION_VERSION:
+            return cls(path=path)
+        return cls(payload.get('names'), path=path)
+
+    def save(self):
+        """Menyimpan cache ke disk jika ada nama baru sejak dimuat."""
+        if self.path is None or not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': NORMALIZATION_VERSION, 'names': self._cache}, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+        self._dirty = False
+
+    def normalize(self, raw_names):
+        """Menormalisasi array nama unik; hanya nama yang belum ada di cache yang diproses."""
+        cache = self._cache
+        result = []
+        for raw in raw_names:
+            normalized = cache.get(raw)
+            if normalized is None:
+                normalized = cache[raw] = self._added[raw] = normalize_name(raw)
+                self._dirty = True
+            result.append(normalized)
+        return result
+
+    def drain(self):
+        """Mengambil (dan mengosongkan) entri yang ditambahkan sejak `drain` terakhir."""
+        added, self._added = self._added, {}
+        return added
+
+    def update(self, entries):
+        """Menggabungkan entri cache dari normalizer lain (mis. dari proses worker)."""
+        if entries:
+            self._cache.update(entries)
+            self._dirty = True
+
+
+def encode_multi_valued(movie_ids, values, encoder, normalizer=None):
+    """
+    Memecah kolom multi-nilai ('a, b, c') dan mengembalikan bridge
+    (Movie_ID, <id dimensi>) yang dibangun dari kode integer.
+
+    Nilai mentah di-factorize sekali; normalisasi dan pencarian surrogate key
+    hanya dilakukan pada nilai unik, lalu hasilnya dipetakan balik ke setiap
+    baris lewat indeks array, tanpa merge berbasis string.
+    """
+    present = values.notna().to_numpy()
+    present_values = values[present]
+    counts = present_values.str.count(', ').to_numpy() + 1
+    # Satu join + split di level Python jauh lebih cepat daripada str.split + explode
+    flat = ', '.join(present_values.tolist()).split(', ')
+    if len(flat) != counts.sum():
+        flat = present_values.str.split(', ').explode().tolist()
+    exploded_ids = np.repeat(movie_ids.to_numpy()[present], counts)
+
+    raw_codes, raw_uniques = pd.factorize(np.asarray(flat, dtype=object))
+    if normalizer is None:
+        name_codes, names = raw_codes, pd.Series(raw_uniques, dtype=values.dtype)
+    else:
+        code_map, unique_names = pd.factorize(np.asarray(normalizer.normalize(raw_uniques), dtype=object))
+        name_codes, names = code_map[raw_codes], pd.Series(unique_names, dtype=values.dtype)
+
+    # Nama unik sudah berurutan sesuai kemunculan pertama, sama seperti ID dimensi
+    dim_ids = encoder.encode(names).to_numpy()
+    bridge = pd.DataFrame({'Movie_ID': exploded_ids, encoder.id_col: dim_ids[name_codes]})
+    # Nama yang sama setelah dibersihkan tidak boleh menggandakan pasangan kunci
+    return bridge.drop_duplicates().reset_index(drop=True)
@@ -0,0 +1,143 @@
+import json
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows: tidak ada getrusage
+    resource = None
+
+# ============================================================================
+# PROFIL PER TAHAP: WAKTU, BARIS MASUK/KELUAR, PUNCAK MEMORI
+# ============================================================================
+# Dipakai oleh ETL (tahap transformasi, muat per tabel, rollup, snapshot) dan
+# oleh dashboard (per bagian). Ringkasan ditampilkan di sidebar dan ditulis
+# ke log JSON Lines agar bisa dibandingkan antar-run.
+
+PROFILE_LOG_PATH = os.path.join('.etl_cache', 'profile.jsonl')
+
+# Profil bagian dashboard ditulis ke log hanya jika variabel ini bernilai 1/true:
+# setiap rerun setiap sesi menambah baris, jadi defaultnya hanya run ETL yang dicatat
+DASHBOARD_LOG_ENV = 'PROFILE_DASHBOARD_LOG'
+
+
+def dashboard_log_path():
+    """PROFILE_LOG_PATH jika log profil dashboard diaktifkan lewat DASHBOARD_LOG_ENV, selain itu None."""
+    enabled = os.environ.get(DASHBOARD_LOG_ENV, '').lower() in ('1', 'true')
+    return PROFILE_LOG_PATH if enabled else None
+
+
+def peak_rss_mb():
+    """
+    Puncak RSS proses ini dalam MB, atau None jika tidak bisa diukur. VmHWM
+    dipakai bila tersedia karena ru_maxrss di Linux ikut mewarisi puncak
+    proses induk melewati exec.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    # ru_maxrss dalam KB di Linux, tetapi dalam byte di macOS
+    unit = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unit
+
+
+def reset_peak_rss():
+    """
+    Mengatur ulang VmHWM ke RSS saat ini (Linux, /proc/self/clear_refs) agar
+    puncak memori bisa diukur per tahap. Jika tidak didukung, `peak_rss_mb`
+    tetap berupa puncak sejak proses dimulai.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def profile_frame(records):
+    """DataFrame berkolom Indonesia dari daftar metrik tahap (lihat `Profiler.records`)."""
+    df = pd.DataFrame(records, columns=['stage', 'seconds', 'rows_in', 'rows_out', 'peak_mb', 'calls'])
+    return df.rename(columns={'stage': 'Tahap', 'seconds': 'Waktu (dtk)', 'rows_in': 'Baris masuk',
+                              'rows_out': 'Baris keluar', 'peak_mb': 'Puncak RSS (MB)', 'calls': 'Panggilan'})
+
+
+class Profiler:
+    """
+    Mengumpulkan metrik per tahap. Tahap dengan nama sama (mis. per chunk)
+    dijumlahkan: waktu dan baris ditambahkan, puncak memori diambil maksimum.
+
+    Puncak memori adalah milik seluruh proses dan `stage` mengatur ulangnya,
+    jadi `measure_memory=False` dipakai bila proses dibagi banyak pengguna
+    (dashboard): pengukuran satu sesi tidak boleh mengacaukan sesi lain.
+    """
+
+    def __init__(self, scope, log_path=PROFILE_LOG_PATH, measure_memory=True):
+        self.scope = scope
+        self.log_path = log_path
+        self.measure_memory = measure_memory
+        self.run_id = uuid.uuid4().hex[:8]
+        self._stages = {}
+
+    def add(self, name, seconds, rows_in=0, rows_out=0, peak_mb=None):
+        """Menambahkan satu pengukuran (mis. yang diukur di proses worker)."""
+        stage = self._stages.setdefault(name, {'stage': name, 'seconds': 0.0, 'rows_in': 0, 'rows_out': 0,
+                                               'peak_mb': None, 'calls': 0})
+        stage['seconds'] += seconds
+        stage['rows_in'] += int(rows_in)
+        stage['rows_out'] += int(rows_out)
+        if peak_mb is not None:
+            stage['peak_mb'] = max(stage['peak_mb'] or 0.0, peak_mb)
+        stage['calls'] += 1
+        return stage
+
+    @contextmanager
+    def stage(self, name, rows_in=0):
+        """
+        Mengukur blok kode sebagai tahap `name`. Blok boleh mengisi
+        `record['rows_out']` (dan mengubah `record['rows_in']`).
+        """
+        record = {'rows_in': rows_in, 'rows_out': 0}
+        if self.measure_memory:
+            reset_peak_rss()
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            self.add(name, time.perf_counter() - started, record['rows_in'], record['rows_out'],
+                     peak_rss_mb() if self.measure_memory else None)
+
+    def records(self, names=None):
+        """Daftar metrik per tahap (urut sesuai kemunculan pertama)."""
+        return [dict(stage) for name, stage in self._stages.items() if names is None or name in names]
+
+    def frame(self):
+        """Ringkasan per tahap sebagai DataFrame untuk ditampilkan di sidebar."""
+        return profile_frame(self.records())
+
+    def summary_lines(self, names=None):
+        """Baris teks '⏱' per tahap (opsional hanya tahap `names`) untuk fungsi `progress`."""
+        return [f"  ⏱ Tahap '{stage['stage']}': {stage['seconds']:.2f} dtk, "
+                f"{stage['rows_in']:,} → {stage['rows_out']:,} baris, "
+                + (f"puncak {stage['peak_mb']:.0f} MB" if stage['peak_mb'] is not None else "puncak tidak terukur")
+                for stage in self.records(names)]
+
+    def write_log(self, names=None):
+        """Menambahkan satu baris JSON (waktu, scope, run_id, daftar tahap) ke `log_path`."""
+        if self.log_path is None:
+            return
+        entry = {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'scope': self.scope, 'run_id': self.run_id,
+                 'stages': self.records(names)}
+        os.makedirs(os.path.dirname(self.log_path) or '.', exist_ok=True)
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
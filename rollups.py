@@ -0,0 +1,91 @@
+import pandas as pd
+
+# ============================================================================
+# TABEL AGREGAT (ROLLUP) UNTUK GRAFIK PER TAHUN DAN PER GENRE
+# ============================================================================
+# Setiap rollup dikunci oleh Year dan Rating (nilai rating persis), sehingga
+# filter rentang tahun + rentang rating di dashboard bisa dijawab hanya dengan
+# menjumlahkan baris rollup tanpa memindai tabel film.
+
+_METRICS = """
+        COUNT(*) AS Movie_Count,
+        SUM(COALESCE(fm.Gross, 0)) AS Gross_Sum,
+        SUM(fm.Rating) AS Rating_Sum,
+        SUM(COALESCE(fm.Votes, 0)) AS Votes_Sum"""
+
+_METRIC_DTYPES = {'Movie_Count': 'int64', 'Gross_Sum': 'float64', 'Rating_Sum': 'float64', 'Votes_Sum': 'int64'}
+
+# nama tabel -> (dtype kolom, kueri agregasi, primary key, index tambahan)
+ROLLUP_TABLES = {
+    'agg_year': (
+        {'Year': 'int64', 'Rating': 'float64', **_METRIC_DTYPES},
+        f"""
+        SELECT dt.Year, fm.Rating,{_METRICS}
+        FROM fact_movie fm
+        JOIN dim_time dt ON fm.Time_ID = dt.Time_ID
+        WHERE fm.Rating IS NOT NULL
+        GROUP BY dt.Year, fm.Rating
+        """,
+        ['Year', 'Rating'], [],
+    ),
+    'agg_year_genre': (
+        {'Year': 'int64', 'Rating': 'float64', 'Genre_ID': 'int64', **_METRIC_DTYPES},
+        f"""
+        SELECT dt.Year, fm.Rating, bg.Genre_ID,{_METRICS}
+        FROM fact_movie fm
+        JOIN dim_time dt ON fm.Time_ID = dt.Time_ID
+        JOIN bridge_genre bg ON bg.Movie_ID = fm.Movie_ID
+        WHERE fm.Rating IS NOT NULL
+        GROUP BY dt.Year, fm.Rating, bg.Genre_ID
+        """,
+        ['Year', 'Rating', 'Genre_ID'], ['Genre_ID'],
+    ),
+}
+
+# Rollup yang sudah tidak dibangun lagi; sisa dari muatan lama dihapus oleh
+# `materialize_rollups` agar tidak tertinggal basi di database
+RETIRED_ROLLUP_TABLES = ['agg_year_genre_director']
+
+ROLLUP_KEYS = {name: (primary_key, indexed) for name, (_, _, primary_key, indexed) in ROLLUP_TABLES.items()}
+
+
+def empty_rollup_frame(table_name):
+    """DataFrame kosong dengan dtype kolom rollup (dipakai untuk membuat tabel staging)."""
+    dtypes = ROLLUP_TABLES[table_name][0]
+    return pd.DataFrame({name: pd.Series(dtype=dtype) for name, dtype in dtypes.items()})
+
+
+def load_rollup_tables(engine):
+    """Mengambil tabel rollup (agg_*) beserta dimensi nama genre dan sutradara."""
+    rollups = {name: pd.read_sql_table(name, con=engine) for name in ROLLUP_TABLES}
+    rollups['dim_genre'] = pd.read_sql_table('dim_genre', con=engine)
+    rollups['dim_director'] = pd.read_sql_table('dim_director', con=engine)
+    return rollups
+
+
+def rollup_window(agg, year_range, rating_range):
+    """Baris rollup di dalam rentang tahun dan rating (inklusif)."""
+    mask = (agg['Year'].between(*year_range)) & (agg['Rating'].between(*rating_range))
+    return agg[mask]
+
+
+def per_year(agg_year, year_range, rating_range):
+    """Total pendapatan dan rata-rata rating per tahun dari rollup `agg_year`."""
+    window = rollup_window(agg_year, year_range, rating_range)
+    totals = window.groupby('Year')[['Movie_Count', 'Gross_Sum', 'Rating_Sum']].sum()
+    totals = totals[totals['Movie_Count'] > 0]
+    return pd.DataFrame({
+        'Year': totals.index,
+        'Gross': totals['Gross_Sum'].to_numpy(),
+        'Rating': (totals['Rating_Sum'] / totals['Movie_Count']).to_numpy(),
+    })
+
+
+def per_genre(agg_year_genre, dim_genre, year_range, rating_range):
+    """Jumlah film dan total pendapatan per nama genre dari rollup `agg_year_genre`."""
+    window = rollup_window(agg_year_genre, year_range, rating_range)
+    totals = window.groupby('Genre_ID')[['Movie_Count', 'Gross_Sum']].sum()
+    totals = totals[totals['Movie_Count'] > 0]
+    totals.index = totals.index.map(dim_genre.set_index('Genre_ID')['Genre_Name'])
+    return totals
+
@@ -0,0 +1,85 @@
+"""
+Menjalankan ETL + pemuatan ke database tanpa Streamlit (mis. dari cron),
+sehingga muatan terjadwal tidak membebani worker dashboard.
+
+Koneksi dan ukuran chunk diambil dari etl_config.json / variabel lingkungan
+ETL_* (lihat database.load_settings); argumen baris perintah menimpa keduanya.
+
+Contoh:
+    python run_etl.py --incremental
+    ETL_DATABASE_URL=mysql+pymysql://etl:rahasia@db/TB_BI python run_etl.py --chunksize 50000
+    0 2 * * * cd /srv/dashboard && python run_etl.py --incremental >> etl.log 2>&1
+"""
+import argparse
+import sys
+import time
+
+from database import create_pooled_engine, load_settings
+from etl import SOURCE_CSV, iter_etl_process, run_etl_process
+from loader import load_to_mysql, materialize_rollups
+from profiling import Profiler
+from snapshot import SNAPSHOT_DIR, publish_snapshot
+
+
+def run_pipeline(engine, csv_path=SOURCE_CSV, incremental=False, chunksize=None, parallel=False,
+                 snapshot_dir=SNAPSHOT_DIR, progress=print, profiler=None):
+    """
+    ETL -> muat tabel -> rollup -> snapshot dashboard, urutan yang sama dengan
+    tombol ETL di dashboard. Mengembalikan True jika semua tahap berhasil.
+    """
+    profiler = profiler if profiler is not None else Profiler('etl')
+    if chunksize:
+        dataframes = iter_etl_process(csv_path, engine=engine, incremental=incremental, chunksize=chunksize,
+                                      parallel=parallel, progress=progress, profiler=profiler)
+    else:
+        dataframes = run_etl_process(csv_path, engine=engine, incremental=incremental,
+                                     parallel=parallel, progress=progress, profiler=profiler)
+    success = load_to_mysql(engine, dataframes, incremental=incremental, progress=progress, profiler=profiler)
+    success = success and materialize_rollups(engine, progress=progress, profiler=profiler)
+    if snapshot_dir is not None:
+        success = success and bool(publish_snapshot(engine, snapshot_dir, progress=progress, profiler=profiler))
+    return success
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Jalankan ETL film dan muat ke database tanpa Streamlit.")
+    parser.add_argument('--config', help="File konfigurasi JSON (default: ETL_CONFIG atau etl_config.json).")
+    parser.add_argument('--csv', default=SOURCE_CSV, help=f"File CSV sumber (default: {SOURCE_CSV}).")
+    parser.add_argument('--database-url', help="URL SQLAlchemy database tujuan.")
+    parser.add_argument('--pool-size', type=int)
+    parser.add_argument('--max-overflow', type=int)
+    parser.add_argument('--pool-recycle', type=int, help="Umur maksimum koneksi di pool (detik).")
+    parser.add_argument('--chunksize', type=int, help="Baca CSV per chunk (0 = sekaligus).")
+    parser.add_argument('--incremental', action='store_true', help="Hanya muat film baru/berubah.")
+    parser.add_argument('--parallel', action='store_true', help="Bangun dimensi di beberapa core.")
+    parser.add_argument('--snapshot-dir', default=SNAPSHOT_DIR,
+                        help=f"Direktori snapshot dashboard (default: {SNAPSHOT_DIR}).")
+    parser.add_argument('--no-snapshot', action='store_true',
+                        help="Jangan publikasikan snapshot dashboard setelah muat.")
+    args = parser.parse_args(argv)
+
+    settings = load_settings(args.config)
+    for key in ('database_url', 'pool_size', 'max_overflow', 'pool_recycle', 'chunksize'):
+        if getattr(args, key) is not None:
+            settings[key] = getattr(args, key)
+
+    engine = create_pooled_engine(settings)
+    profiler = Profiler('etl')
+    started = time.perf_counter()
+    try:
+        success = run_pipeline(engine, args.csv, incremental=args.incremental, chunksize=settings['chunksize'] or None,
+                               parallel=args.parallel, snapshot_dir=None if args.no_snapshot else args.snapshot_dir,
+                               profiler=profiler)
+    except FileNotFoundError:
+        print(f"File '{args.csv}' tidak ditemukan.", file=sys.stderr)
+        success = False
+    finally:
+        profiler.write_log()
+        engine.dispose()
+    print(f"{'Selesai' if success else 'Gagal'} dalam {time.perf_counter() - started:.2f} dtk.")
+    if not success:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
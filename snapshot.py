@@ -0,0 +1,136 @@
+import os
+import shutil
+import time
+import uuid
+
+import pandas as pd
+from pyarrow import feather
+
+from dataset import BRIDGES, build_genre_index, build_year_index, load_movie_dataset, load_plots, names_by_id
+from kpi import build_kpi_index
+from profiling import Profiler
+from rollups import ROLLUP_TABLES, load_rollup_tables
+
+# ============================================================================
+# SNAPSHOT KOLUMNAR (FEATHER/ARROW) UNTUK DASHBOARD
+# ============================================================================
+# Setelah ETL selesai, dataset dashboard dan tabel rollup ditulis sekali ke
+# direktori versi `<SNAPSHOT_DIR>/<id versi>/` sebagai file Feather tanpa
+# kompresi (bisa di-memory-map). File CURRENT menunjuk ke versi aktif, sehingga
+# dashboard cukup membaca id versi untuk tahu kapan cache harus dibuang,
+# tanpa TTL dan tanpa menyentuh database.
+
+SNAPSHOT_DIR = os.path.join('.etl_cache', 'snapshot')
+CURRENT_FILE = 'CURRENT'
+
+# Naikkan jika isi/urutan file snapshot berubah; versi dengan format lain
+# diabaikan sehingga dashboard membuat snapshot baru dari database
+SNAPSHOT_FORMAT = 3
+
+# Jumlah versi yang disimpan di disk (versi aktif + versi sebelumnya, agar
+# sesi yang masih membaca versi lama tidak kehilangan file-nya)
+KEEP_VERSIONS = 2
+
+ROLLUP_FRAMES = list(ROLLUP_TABLES) + ['dim_genre', 'dim_director']
+
+
+def _new_version():
+    return f"v{SNAPSHOT_FORMAT}-{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
+def current_version(directory=SNAPSHOT_DIR):
+    """Id versi snapshot aktif, atau None jika belum pernah dipublikasikan."""
+    path = os.path.join(directory, CURRENT_FILE)
+    try:
+        with open(path, encoding='utf-8') as f:
+            version = f.read().strip()
+    except OSError:
+        return None
+    if not version.startswith(f"v{SNAPSHOT_FORMAT}-") or not os.path.isdir(os.path.join(directory, version)):
+        return None
+    return version
+
+
+def _write_frame(version_dir, name, df):
+    feather.write_feather(df.reset_index(drop=True), os.path.join(version_dir, name + '.feather'),
+                          compression='uncompressed')
+
+
+def _read_frame(version_dir, name):
+    table = feather.read_table(os.path.join(version_dir, name + '.feather'), memory_map=True)
+    return table.to_pandas(split_blocks=True)
+
+
+def _read_only(array):
+    """Menandai array sebagai read-only karena dibagi oleh semua sesi dalam satu proses."""
+    array.flags.writeable = False
+    return array
+
+
+def _prune_versions(directory, keep):
+    versions = sorted(name for name in os.listdir(directory) if os.path.isdir(os.path.join(directory, name)))
+    for name in versions[:-keep]:
+        shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+
+def publish_snapshot(engine, directory=SNAPSHOT_DIR, progress=print, profiler=None):
+    """
+    Membaca dataset dashboard dan rollup dari database, menulisnya sebagai
+    snapshot versi baru, lalu memindahkan penunjuk CURRENT secara atomik.
+    Mengembalikan id versi baru. Tahap baca dan tulis dicatat di `profiler`.
+    """
+    started = time.perf_counter()
+    profiler = profiler if profiler is not None else Profiler('snapshot', log_path=None)
+    with profiler.stage('snapshot:read') as record:
+        dataset = load_movie_dataset(engine)
+        rollups = load_rollup_tables(engine)
+        plots = load_plots(engine, dataset['movies'])
+        record['rows_out'] = len(dataset['movies'])
+
+    version = _new_version()
+    version_dir = os.path.join(directory, version)
+    os.makedirs(version_dir)
+    with profiler.stage('snapshot:write', rows_in=len(dataset['movies'])) as record:
+        _write_frame(version_dir, 'movies', dataset['movies'])
+        _write_frame(version_dir, 'plots', plots.to_frame('Plot'))
+        for bridge_name in BRIDGES:
+            bridge = dataset[bridge_name]
+            _write_frame(version_dir, bridge_name, pd.DataFrame({'movie_pos': bridge['movie_pos'], 'ids': bridge['ids']}))
+        for name in ROLLUP_FRAMES:
+            _write_frame(version_dir, name, rollups[name])
+        record['rows_out'] = len(dataset['movies'])
+
+    temp_path = os.path.join(directory, CURRENT_FILE + '.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(version)
+    os.replace(temp_path, os.path.join(directory, CURRENT_FILE))
+    _prune_versions(directory, KEEP_VERSIONS)
+    progress(f"  ✓ Snapshot dashboard versi {version} ditulis dalam {time.perf_counter() - started:.2f} dtk.")
+    return version
+
+
+def load_snapshot(version, directory=SNAPSHOT_DIR):
+    """
+    Memuat snapshot `version` dari disk dengan memory-map. Mengembalikan
+    (dataset, rollups) dengan bentuk yang sama seperti `load_movie_dataset`
+    dan `load_rollup_tables`, ditambah 'kpi_index' dan 'genre_index' (lihat `build_kpi_index` dan
+    `build_genre_index`).
+    """
+    version_dir = os.path.join(directory, version)
+    rollups = {name: _read_frame(version_dir, name) for name in ROLLUP_FRAMES}
+    movies = _read_frame(version_dir, 'movies')
+    year_index = {key: _read_only(array) for key, array in build_year_index(movies).items()}
+    dataset = {'movies': movies, 'year_index': year_index}
+    for bridge_name, (dim_name, id_col, name_col) in BRIDGES.items():
+        bridge = _read_frame(version_dir, bridge_name)
+        dataset[bridge_name] = {'movie_pos': _read_only(bridge['movie_pos'].to_numpy()),
+                                'ids': _read_only(bridge['ids'].to_numpy()),
+                                'names': _read_only(names_by_id(rollups[dim_name], id_col, name_col))}
+    dataset['kpi_index'] = build_kpi_index(dataset)
+    dataset['genre_index'] = build_genre_index(dataset)
+    return dataset, rollups
+
+
+def load_snapshot_plots(version, directory=SNAPSHOT_DIR):
+    """Kolom Plot snapshot `version` (posisi baris sama dengan 'movies'), dibaca hanya saat dibutuhkan."""
+    return _read_frame(os.path.join(directory, version), 'plots')['Plot']
@@ -0,0 +1,18 @@
+import pytest
+from sqlalchemy import create_engine
+
+from benchmark import generate_csv
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Engine SQLite sementara (abstraksi SQLAlchemy yang sama dengan MySQL)."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'warehouse.db'}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def source_csv(tmp_path):
+    """CSV sintetis kecil berbentuk Top_10000_Movies_IMDb_with_Time.csv."""
+    return generate_csv(tmp_path / 'movies.csv', 300, seed=1)
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from database import DEFAULT_SETTINGS, load_settings
+from run_etl import main
+
+
+def _write_config(path, **settings):
+    path.write_text(json.dumps(settings), encoding='utf-8')
+    return str(path)
+
+
+def test_load_settings_applies_defaults_file_then_environment(tmp_path):
+    config = _write_config(tmp_path / 'etl.json', pool_size=7, max_overflow=3)
+    settings = load_settings(config, environ={'ETL_POOL_SIZE': '9'})
+
+    assert settings['pool_size'] == 9
+    assert settings['max_overflow'] == 3
+    assert settings['pool_recycle'] == DEFAULT_SETTINGS['pool_recycle']
+
+
+def test_load_settings_reads_config_path_from_environment(tmp_path):
+    config = _write_config(tmp_path / 'etl.json', pool_recycle=60)
+    assert load_settings(environ={'ETL_CONFIG': config})['pool_recycle'] == 60
+
+
+def test_load_settings_treats_chunksize_zero_as_whole_file(tmp_path):
+    config = _write_config(tmp_path / 'etl.json', chunksize=50000)
+    assert load_settings(config, environ={})['chunksize'] == 50000
+    assert load_settings(config, environ={'ETL_CHUNKSIZE': '0'})['chunksize'] is None
+
+
+def test_load_settings_rejects_unknown_keys(tmp_path):
+    config = _write_config(tmp_path / 'etl.json', chunk_size=1000)
+    with pytest.raises(ValueError, match='chunk_size'):
+        load_settings(config, environ={})
+
+
+def test_load_settings_requires_explicit_config_to_exist(tmp_path, monkeypatch):
+    missing = str(tmp_path / 'missing.json')
+    with pytest.raises(FileNotFoundError):
+        load_settings(missing, environ={})
+    with pytest.raises(FileNotFoundError):
+        load_settings(environ={'ETL_CONFIG': missing})
+
+    # etl_config.json bawaan boleh tidak ada
+    monkeypatch.chdir(tmp_path)
+    assert load_settings(environ={}) == DEFAULT_SETTINGS
+
+
+def test_command_line_overrides_environment(tmp_path, monkeypatch, source_csv):
+    database = tmp_path / 'cli.db'
+    config = _write_config(tmp_path / 'etl.json', database_url='sqlite:///unused.db', chunksize=100)
+    monkeypatch.setenv('ETL_DATABASE_URL', 'sqlite:///also-unused.db')
+    monkeypatch.chdir(tmp_path)
+
+    main(['--config', config, '--database-url', f'sqlite:///{database}', '--csv', str(source_csv),
+          '--chunksize', '0', '--no-snapshot'])
+
+    assert database.exists()
+    assert not (tmp_path / 'unused.db').exists() and not (tmp_path / 'also-unused.db').exists()
@@ -0,0 +1,36 @@
+import multiprocessing
+
+import pandas as pd
+import pytest
+
+import etl
+from etl import run_etl_process
+
+
+def _assert_same_tables(actual, expected):
+    assert list(actual) == list(expected)
+    for table_name, df in expected.items():
+        pd.testing.assert_frame_equal(actual[table_name].reset_index(drop=True), df.reset_index(drop=True),
+                                      obj=table_name)
+
+
+@pytest.fixture
+def sequential_tables(source_csv):
+    return run_etl_process(source_csv, name_cache=None)
+
+
+@pytest.mark.parametrize('chunksize', [None, 70])
+@pytest.mark.parametrize('parallel', [False, True])
+def test_parallel_and_chunked_match_sequential(source_csv, sequential_tables, chunksize, parallel):
+    tables = run_etl_process(source_csv, chunksize=chunksize, parallel=parallel, name_cache=None)
+    _assert_same_tables(tables, sequential_tables)
+
+
+@pytest.mark.parametrize('chunksize', [None, 70])
+def test_parallel_without_fork_matches_sequential(source_csv, sequential_tables, chunksize, monkeypatch):
+    # Paksa jalur tanpa fork (seperti Windows/macOS): kolom tahap di-pickle ke worker spawn
+    spawn = multiprocessing.get_context('spawn')
+    monkeypatch.setattr(etl.multiprocessing, 'get_all_start_methods', lambda: ['spawn'])
+    monkeypatch.setattr(etl.multiprocessing, 'get_context', lambda method=None: spawn)
+    tables = run_etl_process(source_csv, chunksize=chunksize, parallel=True, name_cache=None)
+    _assert_same_tables(tables, sequential_tables)
@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import create_engine
+
+from benchmark import generate_csv
+from dataset import load_movie_dataset
+from etl import iter_etl_process
+from kpi import build_kpi_index, period_kpis
+from legacy_dashboard import legacy_kpis, load_legacy_movies, random_kpi_windows
+from loader import load_to_mysql
+
+
+@pytest.fixture(scope='module')
+def warehouse(tmp_path_factory):
+    """Dataset dashboard (float32, terurut) dan frame dashboard lama dari gudang SQLite yang sama."""
+    directory = tmp_path_factory.mktemp('kpi')
+    csv_path = generate_csv(directory / 'movies.csv', 3000, seed=2)
+    engine = create_engine(f"sqlite:///{directory / 'warehouse.db'}")
+    load_to_mysql(engine, iter_etl_process(csv_path, chunksize=1000, name_cache=None), progress=lambda _: None)
+    dataset = load_movie_dataset(engine)
+    # Dashboard lama memakai baris pertama dari database saat rating tertinggi imbang;
+    # gudang dimuat urut Movie_ID, jadi urutan itu dipastikan di sini
+    legacy_df = load_legacy_movies(engine).sort_values('Movie_ID', ignore_index=True)
+    engine.dispose()
+    return build_kpi_index(dataset), legacy_df
+
+
+FIXED_WINDOWS = [
+    ((1920, 2023), (1.0, 9.9)),  # seluruh data
+    ((1990, 2010), (5.0, 9.0)),
+    ((2000, 2000), (7.5, 7.5)),  # satu tahun, satu rating
+    ((1921, 1925), (0.0, 10.0)),  # periode sebelumnya di luar data
+    ((1990, 2010), (9.95, 10.0)),  # tidak ada film terpilih
+    ((2030, 2040), (0.0, 10.0)),  # setelah data berakhir
+]
+
+
+@pytest.mark.parametrize('year_range, rating_range', FIXED_WINDOWS)
+def test_period_kpis_match_legacy_dashboard(warehouse, year_range, rating_range):
+    kpi_index, legacy_df = warehouse
+    assert period_kpis(kpi_index, year_range, rating_range) == legacy_kpis(legacy_df, year_range, rating_range)
+
+
+def test_period_kpis_match_legacy_dashboard_on_random_windows(warehouse):
+    kpi_index, legacy_df = warehouse
+    mismatches = [(year_range, rating_range)
+                  for year_range, rating_range in random_kpi_windows(kpi_index['years'], 300, seed=3)
+                  if period_kpis(kpi_index, year_range, rating_range)
+                  != legacy_kpis(legacy_df, year_range, rating_range)]
+    assert mismatches == []
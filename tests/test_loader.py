@@ -0,0 +1,143 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import inspect
+
+import loader
+from etl import STATE_TABLE, run_etl_process
+from loader import (STAGING_SUFFIX, TABLE_KEYS, _infile_path_literal, _write_load_data_csv, load_to_mysql,
+                    materialize_rollups)
+from rollups import RETIRED_ROLLUP_TABLES, ROLLUP_TABLES
+
+
+def _quiet(_):
+    pass
+
+
+def _full_load(engine, csv_path):
+    dataframes = run_etl_process(csv_path, name_cache=None)
+    assert load_to_mysql(engine, dataframes, progress=_quiet)
+    return dataframes
+
+
+def _read(engine, table_name, order_by):
+    return pd.read_sql(f"SELECT * FROM {table_name} ORDER BY {', '.join(order_by)}", engine)
+
+
+def test_full_load_swaps_staging_tables_into_place(engine, source_csv):
+    dataframes = _full_load(engine, source_csv)
+
+    table_names = set(inspect(engine).get_table_names())
+    assert set(dataframes) <= table_names
+    assert not [name for name in table_names if name.endswith(STAGING_SUFFIX)]
+    for table_name, df in dataframes.items():
+        count = pd.read_sql(f"SELECT COUNT(*) AS n FROM {table_name}", engine)['n'].iloc[0]
+        assert count == len(df), table_name
+
+
+def test_full_load_creates_primary_keys_and_indexes(engine, source_csv):
+    dataframes = _full_load(engine, source_csv)
+
+    inspector = inspect(engine)
+    for table_name in dataframes:
+        primary_key, indexed = TABLE_KEYS[table_name]
+        assert inspector.get_pk_constraint(table_name)['constrained_columns'] == primary_key
+        index_columns = [index['column_names'] for index in inspector.get_indexes(table_name)]
+        for column in indexed:
+            assert [column] in index_columns, (table_name, column)
+
+
+def test_failed_swap_leaves_live_tables_intact(engine, source_csv, tmp_path, monkeypatch):
+    _full_load(engine, source_csv)
+    before = _read(engine, 'fact_movie', ['Movie_ID'])
+
+    smaller_csv = tmp_path / 'smaller.csv'
+    pd.read_csv(source_csv).head(50).to_csv(smaller_csv, index=False)
+    original_swap = loader._swap_tables
+
+    def failing_swap(conn, table_names):
+        # Staging tabel terakhir hilang: RENAME gagal setelah tabel lain sempat ditukar
+        loader._drop_table(conn, table_names[-1] + STAGING_SUFFIX)
+        conn.commit()
+        original_swap(conn, table_names)
+
+    monkeypatch.setattr(loader, '_swap_tables', failing_swap)
+    with pytest.raises(Exception, match="no such table"):
+        load_to_mysql(engine, run_etl_process(smaller_csv, name_cache=None), progress=_quiet)
+
+    pd.testing.assert_frame_equal(_read(engine, 'fact_movie', ['Movie_ID']), before)
+    for table_name in TABLE_KEYS:
+        if table_name in ('fact_movie', STATE_TABLE) or table_name.startswith('dim_'):
+            assert inspect(engine).has_table(table_name), table_name
+
+
+def test_incremental_load_replaces_changed_movies(engine, source_csv, tmp_path):
+    _full_load(engine, source_csv)
+    directors_before = _read(engine, 'dim_director', ['Director_ID'])
+
+    source = pd.read_csv(source_csv)
+    changed_id = int(source['ID'].iloc[0])
+    source.loc[0, 'Rating'] = 9.9
+    source.loc[0, 'Genre'] = 'Western'
+    new_movie = source.iloc[[1]].assign(ID=source['ID'].max() + 1, Directors='Brand New Director')
+    changed_csv = tmp_path / 'changed.csv'
+    pd.concat([source, new_movie]).to_csv(changed_csv, index=False)
+
+    changes = run_etl_process(changed_csv, engine=engine, incremental=True, name_cache=None)
+    assert len(changes[STATE_TABLE]) == 2
+    assert load_to_mysql(engine, changes, incremental=True, progress=_quiet)
+
+    facts = _read(engine, 'fact_movie', ['Movie_ID'])
+    assert len(facts) == len(source) + 1
+    assert facts.loc[facts['Movie_ID'] == changed_id, 'Rating'].tolist() == [9.9]
+
+    genres = pd.read_sql("SELECT g.Genre_Name FROM bridge_genre b JOIN dim_genre g ON b.Genre_ID = g.Genre_ID "
+                         f"WHERE b.Movie_ID = {changed_id}", engine)
+    assert genres['Genre_Name'].tolist() == ['Western']
+
+    # Surrogate key lama tidak berubah; sutradara baru mendapat ID lanjutan
+    directors_after = _read(engine, 'dim_director', ['Director_ID'])
+    pd.testing.assert_frame_equal(directors_after.head(len(directors_before)), directors_before)
+    assert directors_after['Director_Name'].iloc[-1] == 'Brand New Director'
+    assert directors_after['Director_ID'].iloc[-1] == directors_before['Director_ID'].max() + 1
+
+
+def test_incremental_load_on_empty_engine_falls_back_to_full_load(engine, source_csv):
+    dataframes = run_etl_process(source_csv, engine=engine, incremental=True, name_cache=None)
+    assert load_to_mysql(engine, dataframes, incremental=True, progress=_quiet)
+
+    table_names = set(inspect(engine).get_table_names())
+    assert set(dataframes) <= table_names
+    assert not [name for name in table_names if name.endswith(STAGING_SUFFIX)]
+    assert len(_read(engine, 'fact_movie', ['Movie_ID'])) == len(pd.read_csv(source_csv))
+
+    # Muatan berikutnya sudah benar-benar inkremental: tidak ada film yang berubah
+    changes = run_etl_process(source_csv, engine=engine, incremental=True, name_cache=None)
+    assert len(changes[STATE_TABLE]) == 0
+
+
+def test_load_data_csv_writes_nulls_and_escapes_backslashes():
+    df = pd.DataFrame({'Rating': [7.5, np.nan], 'Movie_Name': ['A\\B "C", D', None], 'Votes': [10, 20]})
+    buffer = io.StringIO()
+    _write_load_data_csv(buffer, df)
+    assert buffer.getvalue().splitlines() == ['7.5,"A\\\\B ""C"", D",10', '\\N,\\N,20']
+
+
+def test_infile_path_literal_normalizes_windows_paths_and_quotes():
+    assert _infile_path_literal("C:\\Users\\O'Neil\\tmp\\x.csv") == "'C:/Users/O''Neil/tmp/x.csv'"
+    assert _infile_path_literal('/tmp/x.csv') == "'/tmp/x.csv'"
+
+
+def test_materialize_rollups_drops_retired_rollups(engine, source_csv):
+    _full_load(engine, source_csv)
+    with engine.begin() as conn:
+        for table_name in RETIRED_ROLLUP_TABLES:
+            conn.exec_driver_sql(f"CREATE TABLE {table_name} (Year INTEGER)")
+
+    assert materialize_rollups(engine, progress=_quiet)
+
+    table_names = set(inspect(engine).get_table_names())
+    assert set(ROLLUP_TABLES) <= table_names
+    assert not table_names & set(RETIRED_ROLLUP_TABLES)